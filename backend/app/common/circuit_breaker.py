@@ -0,0 +1,79 @@
+"""
+Redis-backed circuit breaker shared by all Celery worker processes.
+
+After `failure_threshold` failures within `window_seconds` the circuit opens for
+`cooldown_seconds`, and callers skip the failing dependency instead of paying its
+full timeout on every task. If Redis is unavailable the breaker stays closed
+(calls go through as if there were no breaker).
+"""
+
+import logging
+from app.services.redis import RedisClient
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Failure counter + open flag in Redis, keyed by breaker name"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, window_seconds: int = 60, cooldown_seconds: int = 60):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self._redis = RedisClient()
+
+    @property
+    def _failures_key(self) -> str:
+        return f"{self.name}:failures"
+
+    @property
+    def _open_key(self) -> str:
+        return f"{self.name}:open"
+
+    @property
+    def _open_total_key(self) -> str:
+        return f"{self.name}:circuit_open_total"
+
+    def is_open(self) -> bool:
+        """True while the cooldown after tripping is running"""
+        client = self._redis._client
+        if not client:
+            return False
+        try:
+            return bool(client.exists(self._open_key))
+        except Exception as e:
+            logger.warning(f"Circuit breaker '{self.name}' check failed: {e}")
+            return False
+
+    def record_failure(self) -> None:
+        """Count a failure; trip the circuit once the threshold is reached within the window"""
+        client = self._redis._client
+        if not client:
+            return
+        try:
+            # SET NX starts a fresh window; INCR counts within it
+            pipe = client.pipeline(transaction=False)
+            pipe.set(self._failures_key, 0, ex=self.window_seconds, nx=True)
+            pipe.incr(self._failures_key)
+            failures = pipe.execute()[1]
+
+            if failures >= self.failure_threshold and client.set(self._open_key, "1", ex=self.cooldown_seconds, nx=True):
+                client.delete(self._failures_key)
+                client.incr(self._open_total_key)  # Monotonic trip counter for monitoring
+                logger.warning(
+                    f"⚡ Circuit '{self.name}' opened after {failures} failures in {self.window_seconds}s "
+                    f"- bypassing for {self.cooldown_seconds}s"
+                )
+        except Exception as e:
+            logger.warning(f"Circuit breaker '{self.name}' failed to record failure: {e}")
+
+    def record_success(self) -> None:
+        """Reset the failure count after a successful call"""
+        client = self._redis._client
+        if not client:
+            return
+        try:
+            client.delete(self._failures_key)
+        except Exception as e:
+            logger.warning(f"Circuit breaker '{self.name}' failed to reset: {e}")
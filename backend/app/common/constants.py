@@ -37,6 +37,41 @@ def get_planning_temperature(creativity: float) -> float:
     """
     return 0.2 + (creativity * 0.6)
 
+# Phase 1 planning models (both must support Structured Outputs)
+# Output is a single VideoPlanning JSON object. A worst-case plan (60s video, 12 beats,
+# reasoning fields and a reference_mapping entry per beat) measures ~4,000-4,500 output
+# tokens; the cap leaves ~2x headroom. A plan truncated at the cap is retried once with
+# double the cap (see phase1_validate/task.py _parse_plan)
+PHASE1_PRIMARY_MODEL = os.getenv('PHASE1_PRIMARY_MODEL', 'gpt-4o-mini')
+PHASE1_FALLBACK_MODEL = os.getenv('PHASE1_FALLBACK_MODEL', 'gpt-4o')
+PHASE1_MAX_OUTPUT_TOKENS = int(os.getenv('PHASE1_MAX_OUTPUT_TOKENS', '8000'))
+# In-process retries (exponential backoff + jitter, Retry-After honored) on 429/5xx/timeouts
+# for the primary model before escalating to the pricier fallback model. Retries are cut
+# short when they would eat into the time reserved for the fallback (PHASE1_SOFT_TIME_LIMIT)
+PHASE1_MAX_RETRIES = int(os.getenv('PHASE1_MAX_RETRIES', '4'))
+# Circuit breaker on the primary model: after this many failures within the window,
+# go straight to the fallback model for the cooldown period
+PHASE1_BREAKER_THRESHOLD = int(os.getenv('PHASE1_BREAKER_THRESHOLD', '5'))
+PHASE1_BREAKER_WINDOW = int(os.getenv('PHASE1_BREAKER_WINDOW', '60'))
+PHASE1_BREAKER_COOLDOWN = int(os.getenv('PHASE1_BREAKER_COOLDOWN', '60'))
+# Seconds to wait on the primary model before also starting the fallback (0 = no hedging)
+PHASE1_HEDGE_DELAY = float(os.getenv('PHASE1_HEDGE_DELAY', '0'))
+# Time budget for the whole Phase 1 task. Planning calls (primary retries + one fallback
+# attempt of up to PHASE1_TIMEOUT) are deadline-bounded to finish within it on any worker
+# pool; Celery's soft/hard time limits (PHASE1_TIME_LIMIT) are only backstops
+PHASE1_SOFT_TIME_LIMIT = int(os.getenv('PHASE1_SOFT_TIME_LIMIT', '180'))
+PHASE1_TIME_LIMIT = int(os.getenv('PHASE1_TIME_LIMIT', str(PHASE1_SOFT_TIME_LIMIT + 30)))
+
+# Reuse a previous Phase 1 plan for an identical (normalized) prompt + creativity + assets
+PLAN_CACHE_ENABLED = os.getenv('PLAN_CACHE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+
+# Phase 2 storyboard images generated concurrently (each beat is an independent
+# Replicate prediction + download + S3 upload, almost all of it spent waiting)
+PHASE2_MAX_CONCURRENCY = int(os.getenv('PHASE2_MAX_CONCURRENCY', '8'))
+
+# Pretty-print (indent=2) JSON dumps in DEBUG logs instead of compact output
+LOG_PRETTY_JSON = os.getenv('LOG_PRETTY_JSON', 'false').lower() in ('1', 'true', 'yes')
+
 # Cost per API call (USD)
 COST_GPT4_TURBO = 0.01
 COST_SDXL_IMAGE = 0.0055  # Legacy, not used anymore
@@ -179,7 +214,7 @@ def get_asset_thumbnail_s3_key(user_id: str, filename: str) -> str:
     return f"{user_id}/assets/{base_name}_thumbnail.jpg"
 
 # Timeouts (seconds)
-PHASE1_TIMEOUT = 60
+PHASE1_TIMEOUT = 60  # Per OpenAI attempt in Phase 1
 PHASE2_TIMEOUT = 300
 PHASE3_TIMEOUT = 300
 PHASE4_TIMEOUT = 600
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, String, Float, DateTime, JSON, Enum as SQLEnum, Integer, Boolean, ARRAY, Text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from app.database import Base
 import enum
@@ -140,7 +141,7 @@ class VideoGeneration(Base):
     final_video_url = Column(String, nullable=True)
     final_music_url = Column(String, nullable=True)  # Music URL from Phase 5 (saved even if combining fails)
     thumbnail_url = Column(String, nullable=True)  # Thumbnail image URL (640x360) for My Projects page
-    phase_outputs = Column(JSON, default=dict)  # Store outputs from each phase
+    phase_outputs = Column(JSON().with_variant(JSONB(), "postgresql"), default=dict)  # Store outputs from each phase (JSONB on Postgres)
     
     # Note: creativity_level, selected_archetype, num_beats, num_chunks stored in spec JSON
     
@@ -33,11 +33,18 @@ class Settings(BaseSettings):
     aws_secret_access_key: str
     s3_bucket: str
     aws_region: str = "us-east-2"
+    s3_max_pool_connections: int = 32  # Shared boto3 client - must cover concurrent uploads (e.g. Phase 2 beats)
     
     # Application
     environment: str = "development"
     debug: bool = True
     
+    # Database connection pool (per process - size to the worker's concurrency)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 10  # Seconds to wait for a free connection before raising
+    db_pool_recycle: int = 1800  # Recycle connections before server/proxy idle timeouts drop them
+    
     # CLIP Model Configuration
     clip_model: str = Field(
         default="ViT-B/32",
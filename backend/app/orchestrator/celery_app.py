@@ -26,6 +26,12 @@ celery_app.conf.update(
     task_soft_time_limit=25 * 60,  # 25 minutes soft limit
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=50,
+    # Phase 1 is almost entirely waiting on OpenAI - run it on its own queue so it can
+    # be served by a gevent-pool worker (-Q llm_io -P gevent) instead of holding a
+    # prefork process per in-flight request. CPU-heavy phases stay on the default queue.
+    task_routes={
+        "app.phases.phase1_validate.task.plan_video_intelligent": {"queue": "llm_io"},
+    },
     # Include all task modules so Celery can discover them
     include=[
         "app.orchestrator.pipeline",
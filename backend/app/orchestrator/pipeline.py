@@ -41,10 +41,10 @@ def run_pipeline(self, video_id: str, prompt: str, assets: list = None, model: s
     if assets is None:
         assets = []
     
-    print(f"🚀 run_pipeline task executing for video {video_id}")
-    print(f"   - Prompt: {prompt[:100]}...")
-    print(f"   - Assets: {len(assets)}")
-    print(f"   - Model: {model}")
+    logger.info("🚀 run_pipeline task executing for video %s", video_id)
+    logger.info("   - Prompt: %.100s...", prompt)
+    logger.info("   - Assets: %d", len(assets))
+    logger.info("   - Model: %s", model)
     
     # Get user_id from video record for S3 path organization
     # Note: Video record is already created in generate.py endpoint
@@ -60,25 +60,25 @@ def run_pipeline(self, video_id: str, prompt: str, assets: list = None, model: s
             # Fallback to mock user ID if not set (for development/testing)
             from app.common.constants import MOCK_USER_ID
             user_id = MOCK_USER_ID
-            print(f"⚠️  No user_id found for video {video_id}, using mock user ID: {user_id}")
+            logger.warning("⚠️  No user_id found for video %s, using mock user ID: %s", video_id, user_id)
         
         # Update status to validating (Phase 1 will start)
         # This is a critical update (initial state), so write to DB
         video.status = VideoStatus.VALIDATING
         db.commit()
-        print(f"✅ Updated video {video_id} status to VALIDATING in DB")
+        logger.info("✅ Updated video %s status to VALIDATING in DB", video_id)
         
         # Also update Redis (video should already be in Redis from generate.py, but update status)
         if redis_client._client:
             try:
                 redis_client.set_video_status(video_id, VideoStatus.VALIDATING.value)
-                print(f"✅ Updated video {video_id} status in Redis")
+                logger.info("✅ Updated video %s status in Redis", video_id)
             except Exception as e:
                 logger.warning(f"Failed to update Redis: {e}")
     finally:
         db.close()
     
-    print(f"🔗 Creating chain workflow for video {video_id}...")
+    logger.info("🔗 Creating chain workflow for video %s...", video_id)
     
     # Create chain workflow - each phase receives previous phase's PhaseOutput as first arg
     workflow = chain(
@@ -98,12 +98,10 @@ def run_pipeline(self, video_id: str, prompt: str, assets: list = None, model: s
         refine_video.s(user_id)
     )
     
-    print(f"🔗 Chain created, dispatching with apply_async()...")
+    logger.info("🔗 Chain created, dispatching with apply_async()...")
     result = workflow.apply_async()
     
-    print(f"✅ Pipeline chain dispatched for video {video_id}")
-    print(f"   - Workflow ID: {result.id}")
-    print(f"   - Worker thread freed - can process more videos concurrently")
+    logger.info("✅ Pipeline chain dispatched for video %s (workflow %s)", video_id, result.id)
     
     # Return immediately - worker thread freed!
     return {
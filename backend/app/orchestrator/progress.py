@@ -1,8 +1,11 @@
 # Update progress/status with Redis caching and DB fallback
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Dict, Any
 import logging
+import orjson
+from sqlalchemy import text, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
 from app.database import SessionLocal
 from app.common.models import VideoGeneration, VideoStatus
 from app.common.constants import MOCK_USER_ID
@@ -38,16 +41,16 @@ def update_progress(
     """
     redis_write_failed = False
     
-    # Try Redis first (if available)
+    # Try Redis first (if available) - all fields go out in a single pipelined round-trip
     if redis_client._client:
         try:
             # Set basic fields
+            fields = {"status": status}
             if progress is not None:
-                redis_client.set_video_progress(video_id, progress)
-            redis_client.set_video_status(video_id, status)
+                fields["progress"] = str(progress)
             
             if "current_phase" in kwargs:
-                redis_client.set_video_phase(video_id, kwargs["current_phase"])
+                fields["current_phase"] = kwargs["current_phase"]
             
             # Build metadata dict
             metadata = {}
@@ -62,25 +65,21 @@ def update_progress(
             if "generation_time" in kwargs:
                 metadata["generation_time"] = kwargs["generation_time"]
             if metadata:
-                redis_client.set_video_metadata(video_id, metadata)
+                fields["metadata"] = metadata
             
             # Set error message
             if "error" in kwargs or "error_message" in kwargs:
                 error_msg = kwargs.get("error") or kwargs.get("error_message")
                 if error_msg:
-                    redis_client._client.set(
-                        redis_client._key(video_id, "error_message"),
-                        error_msg,
-                        ex=3600
-                    )
+                    fields["error_message"] = error_msg
             
             # Set spec (Redis only, not DB until final submission)
             if "spec" in kwargs:
-                redis_client.set_video_spec(video_id, kwargs["spec"])
+                fields["spec"] = kwargs["spec"]
             
             # Set phase outputs (nested JSON structure)
             if "phase_outputs" in kwargs:
-                redis_client.set_video_phase_outputs(video_id, kwargs["phase_outputs"])
+                fields["phase_outputs"] = kwargs["phase_outputs"]
             elif "current_chunk_index" in kwargs:
                 # Handle Phase 3 chunk progress tracking
                 # Get existing phase_outputs from Redis or create new
@@ -93,7 +92,10 @@ def update_progress(
                 if "total_chunks" in kwargs:
                     phase_outputs["phase3_chunks"]["total_chunks"] = kwargs["total_chunks"]
                 
-                redis_client.set_video_phase_outputs(video_id, phase_outputs)
+                fields["phase_outputs"] = phase_outputs
+            
+            if not redis_client.set_video_fields(video_id, fields):
+                redis_write_failed = True
             
         except Exception as e:
             logger.warning(f"Redis update failed, falling back to DB: {e}")
@@ -210,9 +212,7 @@ def update_cost(video_id: str, phase: str, cost: float) -> None:
             logger.warning(f"Failed to update cost in Redis: {e}")
     
     # Update DB cost_breakdown (for final persistence)
-    db = SessionLocal()
-    
-    try:
+    with SessionLocal() as db:
         video = db.query(VideoGeneration).filter(VideoGeneration.id == video_id).first()
         
         if video:
@@ -229,7 +229,52 @@ def update_cost(video_id: str, phase: str, cost: float) -> None:
             db.commit()
             
             # Log cost update to terminal
-            print(f"   💰 {phase.upper()} cost updated: ${cost:.4f} | Running total: ${video.cost_usd:.4f}")
+            logger.info("   💰 %s cost updated: $%.4f | Running total: $%.4f", phase.upper(), cost, video.cost_usd)
+
+
+def store_phase_output(
+    video_id: str,
+    phase: str,
+    output: Dict[str, Any],
+    columns: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Store one phase's output under phase_outputs[phase] in the DB.
     
-    finally:
-        db.close()
+    On Postgres this is a single UPDATE replacing just that key server-side with
+    jsonb_set (no SELECT of the full row, which carries the spec and every earlier
+    phase's output; requires the JSONB column from migration 006). Other dialects
+    fall back to the ORM read-modify-write. No-op if the video row doesn't exist.
+    
+    Args:
+        video_id: Unique identifier for the video
+        phase: phase_outputs key (e.g., "phase2_storyboard")
+        output: PhaseOutput dict to store
+        columns: Optional other VideoGeneration columns to set in the same UPDATE
+            (e.g., {"stitched_url": ...})
+    """
+    columns = columns or {}
+    with SessionLocal() as db:
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(
+                update(VideoGeneration)
+                .where(VideoGeneration.id == video_id)
+                .values(
+                    phase_outputs=text(
+                        "jsonb_set(COALESCE(phase_outputs, '{}'::jsonb), "
+                        "ARRAY[CAST(:phase AS text)], CAST(:payload AS jsonb))"
+                    ).bindparams(phase=phase, payload=orjson.dumps(output).decode()),
+                    **columns
+                )
+            )
+        else:
+            video = db.query(VideoGeneration).filter(VideoGeneration.id == video_id).first()
+            if not video:
+                return
+            if video.phase_outputs is None:
+                video.phase_outputs = {}
+            video.phase_outputs[phase] = output
+            flag_modified(video, 'phase_outputs')
+            for column, value in columns.items():
+                setattr(video, column, value)
+        db.commit()
@@ -6,7 +6,7 @@ Only runs if user has reference assets available (performance optimization).
 """
 
 import logging
-import json
+import orjson
 from typing import Optional
 from sqlalchemy.orm import Session
 from app.services.openai import openai_client
@@ -135,12 +135,15 @@ class EntityExtractionService:
             )
             
             content = response.choices[0].message.content
-            logger.info(f"✅ LLM response received:")
-            logger.info(f"   Raw content: {content}")
+            logger.info("✅ LLM response received (%d chars)", len(content))
+            logger.debug("   Raw content: %s", content)
             
-            entities = json.loads(content)
+            entities = orjson.loads(content)
             
-            logger.info(f"📦 Parsed entities: {json.dumps(entities, indent=2)}")
+            logger.info("📦 Parsed %d entity fields: %s", len(entities), ", ".join(entities))
+            if logger.isEnabledFor(logging.DEBUG):
+                # Only re-serialize the full payload when someone is reading it
+                logger.debug("   Entities: %s", orjson.dumps(entities).decode())
             
             # Validate structure
             return {
@@ -51,7 +51,8 @@ def prepare_references(
     
     logger.info(f"🔍 Phase 0 (Reference Preparation) starting for video {video_id}")
     logger.info(f"   User: {user_id}")
-    logger.info(f"   Prompt: {prompt[:100]}{'...' if len(prompt) > 100 else ''}")
+    short_prompt = prompt if len(prompt) <= 100 else prompt[:100] + "..."
+    logger.info("   Prompt: %s", short_prompt)
     
     try:
         # Step 1: Extract entities (checks for assets internally)
@@ -6,10 +6,12 @@ in selecting template archetypes and composing beat sequences.
 """
 
 import json
+from functools import lru_cache
 from app.common.beat_library import BEAT_LIBRARY
 from app.common.template_archetypes import TEMPLATE_ARCHETYPES
 
 
+@lru_cache(maxsize=1)
 def build_planning_system_prompt() -> str:
     """
     Build comprehensive system prompt for Phase 1 planning LLM.
@@ -20,6 +22,8 @@ def build_planning_system_prompt() -> str:
     3. Compose beat sequence from beat library
     4. Build style specification
     
+    Rendered once per process - the archetype and beat libraries are static.
+    
     Returns:
         Complete system prompt string with all archetypes, beats, and instructions
     """
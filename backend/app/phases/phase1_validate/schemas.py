@@ -3,6 +3,9 @@ from typing import Dict, List, Optional
 
 
 # ===== Structured Output Schemas for LLM Planning =====
+# NOTE: Class docstrings and Field descriptions are sent to the model as part of the
+# JSON schema on every planning call. Keep them to short hints - detailed rules live
+# in the system prompt (phase1_validate/task.py).
 
 class ProductInfo(BaseModel):
     """Product information extracted from user prompt"""
@@ -23,13 +26,7 @@ class BeatInfo(BaseModel):
     """Individual beat in the sequence with composed prompt"""
     beat_id: str = Field(description="Beat identifier from BEAT_LIBRARY")
     duration: int = Field(description="Beat duration - MUST be 5, 10, or 15 seconds ONLY")
-    composed_prompt: str = Field(
-        description="Full scene description composed by LLM (2-3 sentences). "
-                    "Should incorporate product, style, colors, mood, and create narrative flow. "
-                    "Example: 'Close-up shot of the luxury watch on a man's wrist as he adjusts the time. "
-                    "Dramatic golden lighting highlights the polished metal finish and intricate dial details. "
-                    "Slow dolly movement creates cinematic elegance.'"
-    )
+    composed_prompt: str = Field(description="Full scene description for this beat (1-2 sentences)")
 
 
 class StyleSpec(BaseModel):
@@ -47,32 +44,30 @@ class ReferenceAssetMapping(BaseModel):
     rationale: str = Field(description="1-2 sentences explaining why these assets were chosen for this beat")
 
 
+# Example VideoPlanning output (kept out of the docstring so it isn't sent with the schema):
+# {
+#     "reasoning_process": "User wants a luxury watch ad with elegant feel...",
+#     "intent_analysis": {...},
+#     "brand_name": "Rolex",
+#     "music_theme": "cinematic orchestral",
+#     "color_scheme": ["gold", "black", "deep blue"],
+#     "scene_requirements": {
+#         "hero_shot": "show watch on wrist",
+#         "call_to_action": "include brand logo prominently"
+#     },
+#     "selected_archetype": "luxury_showcase",
+#     "beat_sequence": [
+#         {
+#             "beat_id": "hero_shot",
+#             "duration": 5,
+#             "composed_prompt": "Close-up shot of the Rolex watch..."
+#         }
+#     ],
+#     "style": {...},
+#     "reference_mapping": {...}
+# }
 class VideoPlanning(BaseModel):
-    """Complete video planning output with reasoning (for structured outputs)
-    
-    Example output:
-    {
-        "reasoning_process": "User wants a luxury watch ad with elegant feel...",
-        "intent_analysis": {...},
-        "brand_name": "Rolex",
-        "music_theme": "cinematic orchestral",
-        "color_scheme": ["gold", "black", "deep blue"],
-        "scene_requirements": {
-            "hero_shot": "show watch on wrist",
-            "call_to_action": "include brand logo prominently"
-        },
-        "selected_archetype": "luxury_showcase",
-        "beat_sequence": [
-            {
-                "beat_id": "hero_shot",
-                "duration": 5,
-                "composed_prompt": "Close-up shot of the Rolex watch..."
-            }
-        ],
-        "style": {...},
-        "reference_mapping": {...}
-    }
-    """
+    """Complete video planning output with reasoning (for structured outputs)"""
     reasoning_process: Optional[str] = Field(
         default=None,
         description="Step-by-step thought process explaining decisions (2-4 sentences)"
@@ -80,26 +75,19 @@ class VideoPlanning(BaseModel):
     intent_analysis: IntentAnalysis
     brand_name: Optional[str] = Field(
         default=None,
-        description="Company/brand name extracted from prompt (e.g., 'Nike', 'Apple', 'Rolex'). "
-                    "Extract if explicitly mentioned, otherwise None. "
-                    "Used for closing beat brand overlay if no logo asset available."
+        description="Brand name if explicitly mentioned, otherwise None"
     )
     music_theme: Optional[str] = Field(
         default=None,
-        description="Music genre/mood for the video (e.g., 'upbeat electronic', 'cinematic orchestral', 'hip-hop beats'). "
-                    "Extract if user mentions music preferences, otherwise infer based on archetype and mood."
+        description="Music genre/mood (extracted or inferred)"
     )
     color_scheme: Optional[List[str]] = Field(
         default=None,
-        description="List of 3-5 primary colors for the video (e.g., ['gold', 'black', 'white'], ['red', 'orange', 'yellow']). "
-                    "Extract if user specifies colors, otherwise infer based on product category and style. "
-                    "Should be consistent across all beat prompts."
+        description="3-5 colors if the user specified colors, otherwise None"
     )
     scene_requirements: Optional[Dict[str, str]] = Field(
         default=None,
-        description="Dict mapping beat_ids to specific user scene requirements. "
-                    "Only include if user explicitly describes specific scenes. "
-                    "Example: {'hero_shot': 'show watch on wrist', 'usage_scenario': 'person running outdoors'}"
+        description="beat_id -> user-specified scene requirement (only if explicitly described)"
     )
     selected_archetype: str = Field(description="Selected archetype ID from TEMPLATE_ARCHETYPES")
     archetype_reasoning: str = Field(description="1-2 sentences explaining archetype choice")
@@ -107,12 +95,12 @@ class VideoPlanning(BaseModel):
     beat_selection_reasoning: str = Field(description="1-2 sentences explaining beat choices")
     duration_verification: Optional[str] = Field(
         default=None,
-        description="Explicit verification that beat durations sum to total duration"
+        description="Check that beat durations sum to total duration"
     )
     style: StyleSpec
     reference_mapping: Optional[Dict[str, ReferenceAssetMapping]] = Field(
         default=None,
-        description="Optional mapping of beat_id to reference assets (empty if user has no assets)"
+        description="beat_id -> reference assets (None if user has no assets)"
     )
 
 
@@ -4,33 +4,96 @@ Phase 1: Intelligent Planning Task with o1-preview (Structured Outputs)
 This implementation uses:
 - o1-preview reasoning model for superior planning
 - Structured Outputs via Pydantic schemas (no JSON parsing)
-- Automatic fallback to GPT-4 Turbo if o1-preview fails
+- Automatic fallback to gpt-4o (also Structured Outputs) if the primary model fails
 - Beat library (15 reusable beats)
 - Template archetypes (5 high-level guides)
 """
 
-import json
 import time
+import random
+import hashlib
+import traceback
 import logging
+import orjson
+import openai
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import cache, lru_cache
+from celery.exceptions import SoftTimeLimitExceeded
+from celery.signals import worker_init
 from app.orchestrator.celery_app import celery_app
-from app.common.schemas import PhaseOutput
+from app.orchestrator.progress import update_cost
 from app.services.openai import openai_client
+from app.services.redis import RedisClient
+from app.common.circuit_breaker import CircuitBreaker
+from app.common.exceptions import PhaseException
 from app.phases.phase1_validate.validation import validate_spec, build_full_spec, validate_llm_beat_durations
 from app.phases.phase1_validate.schemas import VideoPlanning
-from app.common.constants import BEAT_COMPOSITION_CREATIVITY, get_planning_temperature
-from app.common.beat_library import BEAT_LIBRARY
-from app.common.template_archetypes import TEMPLATE_ARCHETYPES
+from app.common.constants import (
+    BEAT_COMPOSITION_CREATIVITY,
+    PHASE1_PRIMARY_MODEL,
+    PHASE1_FALLBACK_MODEL,
+    PHASE1_MAX_OUTPUT_TOKENS,
+    PHASE1_MAX_RETRIES,
+    PHASE1_BREAKER_THRESHOLD,
+    PHASE1_BREAKER_WINDOW,
+    PHASE1_BREAKER_COOLDOWN,
+    PLAN_CACHE_ENABLED,
+    LOG_PRETTY_JSON,
+    PHASE1_TIMEOUT,
+    PHASE1_HEDGE_DELAY,
+    PHASE1_SOFT_TIME_LIMIT,
+    PHASE1_TIME_LIMIT,
+    get_planning_temperature,
+)
 
 logger = logging.getLogger(__name__)
 
 # Configuration flags
-USE_GPT4O_MINI = True  # Set to False to use GPT-4 Turbo by default
-GPT4O_MINI_FALLBACK = True  # Auto-fallback to gpt-4-turbo-preview if gpt-4o-mini fails
+USE_GPT4O_MINI = True  # Set to False to use gpt-4o by default
+GPT4O_MINI_FALLBACK = True  # Auto-fallback to gpt-4o if gpt-4o-mini fails
+# Retries for the fallback model (the OpenAI SDK's default)
+FALLBACK_MAX_RETRIES = 2
+
+# Planning calls must finish this long before PHASE1_SOFT_TIME_LIMIT, leaving time to
+# build/validate the spec and report the result
+_DEADLINE_MARGIN = 10
+# Don't start an API attempt with less time than this left
+_MIN_ATTEMPT_SECONDS = 5
+# Output token limit of both planning models (gpt-4o, gpt-4o-mini) - caps the truncation retry
+_MAX_OUTPUT_TOKENS_CEILING = 16384
+
+# VideoPlanning fields that only carry the model's chain-of-thought (not used by build_full_spec)
+_REASONING_FIELDS = {'reasoning_process', 'duration_verification'}
+
+# Redis client for the plan cache (PLAN_CACHE_ENABLED)
+redis_client = RedisClient()
+
+# Shared across workers: while the primary model keeps failing, skip it instead of
+# paying its full timeout + retries on every task
+primary_breaker = CircuitBreaker(
+    "phase1:gpt4o-mini",
+    failure_threshold=PHASE1_BREAKER_THRESHOLD,
+    window_seconds=PHASE1_BREAKER_WINDOW,
+    cooldown_seconds=PHASE1_BREAKER_COOLDOWN
+)
 
 
 # ===== Task Entry Point =====
 
-@celery_app.task(bind=True)
+# The time budget is enforced inside the task: every OpenAI call is bounded by a deadline
+# derived from PHASE1_SOFT_TIME_LIMIT (see _task_deadline), so a hung API ends in a failed
+# PhaseOutput + dead-letter entry on any pool - including the gevent pool the llm_io
+# worker runs, which ignores soft limits. soft_time_limit / time_limit are backstops
+# for anything else that hangs; a SoftTimeLimitExceeded skips the fallback model.
+# acks_late + reject_on_worker_lost: a worker that dies mid-call puts the task back on
+# the queue instead of silently dropping the video's planning step.
+@celery_app.task(
+    bind=True,
+    soft_time_limit=PHASE1_SOFT_TIME_LIMIT,
+    time_limit=PHASE1_TIME_LIMIT,
+    acks_late=True,
+    reject_on_worker_lost=True
+)
 def plan_video_intelligent(
     self,
     phase0_output: dict,
@@ -61,7 +124,7 @@ def plan_video_intelligent(
         - duration_seconds: Time taken
         - error_message: Error details if failed
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     # Extract data from phase0_output
     if phase0_output:
@@ -89,7 +152,8 @@ def plan_video_intelligent(
     
     # Log phase start
     logger.info(f"🚀 Phase 1 (Intelligent Planning) starting for video {video_id}")
-    logger.info(f"   Prompt: {prompt[:100]}{'...' if len(prompt) > 100 else ''}")
+    short_prompt = prompt if len(prompt) <= 100 else prompt[:100] + "..."
+    logger.info("   Prompt: %s", short_prompt)
     logger.info(f"   Creativity level: {creativity_level}")
     logger.info(f"   User has assets: {has_assets}")
     if has_assets:
@@ -105,6 +169,9 @@ def plan_video_intelligent(
         logger.info(f"   Model forced: {force_model}")
     else:
         use_mini = USE_GPT4O_MINI
+        if use_mini and GPT4O_MINI_FALLBACK and primary_breaker.is_open():
+            logger.warning(f"   ⚡ {PHASE1_PRIMARY_MODEL} circuit open - going straight to {PHASE1_FALLBACK_MODEL}")
+            use_mini = False
         logger.info(f"   Using gpt-4o-mini: {use_mini}")
     
     # Package reference context for planning functions
@@ -117,49 +184,94 @@ def plan_video_intelligent(
         'product_mentioned': product_mentioned
     }
     
+    plan_lock_key = None
+    
     try:
+        # Reuse a cached plan for an identical prompt (skips the LLM call entirely)
+        if PLAN_CACHE_ENABLED and not force_model:
+            cache_key = _plan_cache_key(prompt, creativity_level, reference_context)
+            cached_output = redis_client.get_cached_plan(cache_key)
+            
+            # Coalesce identical in-flight prompts: the first task plans, the rest wait
+            # for its result to land in the plan cache instead of paying for the same call.
+            # The lock lives as long as the leader's whole budget (retries + fallback), and
+            # followers wait for it within their own budget
+            if not cached_output and redis_client._client:
+                if redis_client.acquire_plan_lock(cache_key, PHASE1_SOFT_TIME_LIMIT):
+                    plan_lock_key = cache_key
+                else:
+                    logger.info("   ⏳ Identical prompt already being planned - waiting for its result")
+                    cached_output = _wait_for_cached_plan(
+                        cache_key,
+                        _task_deadline(start_time) - time.perf_counter()
+                    )
+            
+            if cached_output:
+                logger.info("   ♻️  Plan cache hit - skipping LLM call")
+                return plan_from_cache(video_id, cached_output, start_time, reference_context, phase0_output)
+        
         if use_mini:
+            # Race gpt-4o-mini against a delayed gpt-4o hedge (opt-in, cuts tail latency)
+            if GPT4O_MINI_FALLBACK and PHASE1_HEDGE_DELAY > 0:
+                return plan_hedged(video_id, prompt, creativity_level, start_time, reference_context, phase0_output)
+            
             # Try gpt-4o-mini first
             try:
-                logger.info("   Attempting gpt-4o-mini...")
+                logger.info(f"   Attempting {PHASE1_PRIMARY_MODEL}...")
                 result = plan_with_gpt4o_mini(video_id, prompt, creativity_level, start_time, reference_context, phase0_output)
-                logger.info("✅ gpt-4o-mini succeeded")
+                logger.info(f"✅ {PHASE1_PRIMARY_MODEL} succeeded")
                 return result
             
+            except SoftTimeLimitExceeded:
+                # Out of budget - don't start a fallback call past the deadline
+                raise
             except Exception as e:
-                logger.error(f"❌ gpt-4o-mini failed: {str(e)}")
+                logger.error(f"❌ {PHASE1_PRIMARY_MODEL} failed: {str(e)}")
                 
                 if GPT4O_MINI_FALLBACK:
-                    logger.info("🔄 Falling back to gpt-4-turbo-preview")
-                    result = plan_with_gpt4_turbo(video_id, prompt, creativity_level, start_time, reference_context, phase0_output)
-                    logger.info("✅ gpt-4-turbo-preview fallback succeeded")
+                    logger.info(f"🔄 Falling back to {PHASE1_FALLBACK_MODEL}")
+                    result = plan_with_gpt4o(video_id, prompt, creativity_level, start_time, reference_context, phase0_output)
+                    logger.info(f"✅ {PHASE1_FALLBACK_MODEL} fallback succeeded")
                     return result
                 else:
                     raise
         else:
-            # Use gpt-4-turbo-preview directly
-            logger.info("   Using gpt-4-turbo-preview (direct)")
-            result = plan_with_gpt4_turbo(video_id, prompt, creativity_level, start_time, reference_context, phase0_output)
-            logger.info("✅ gpt-4-turbo-preview succeeded")
+            # Use gpt-4o directly
+            logger.info(f"   Using {PHASE1_FALLBACK_MODEL} (direct)")
+            result = plan_with_gpt4o(video_id, prompt, creativity_level, start_time, reference_context, phase0_output)
+            logger.info(f"✅ {PHASE1_FALLBACK_MODEL} succeeded")
             return result
         
     except Exception as e:
         # Calculate duration
-        duration_seconds = time.time() - start_time
+        duration_seconds = time.perf_counter() - start_time
         
-        logger.error(f"❌ Phase 1 failed for video {video_id}: {str(e)}")
-        logger.error(f"   Error type: {type(e).__name__}")
+        # Traceback is formatted once, inside the logging handler
+        logger.exception("❌ Phase 1 failed for video %s: %s", video_id, e)
         
-        # Failure - return PhaseOutput with error
-        return PhaseOutput(
-            video_id=video_id,
-            phase="phase1_planning",
-            status="failed",
-            output_data={},
-            cost_usd=0.0,
-            duration_seconds=duration_seconds,
-            error_message=str(e)
-        ).dict()
+        # Full context goes to the dead-letter list for offline diagnostics
+        redis_client.push_phase1_dead_letter({
+            "video_id": video_id,
+            "prompt": prompt,
+            "error": str(e),
+            "traceback": traceback.format_exc(),
+            "failed_at": time.time()
+        })
+        
+        # Failure - return PhaseOutput fields with error
+        return {
+            "video_id": video_id,
+            "phase": "phase1_planning",
+            "status": "failed",
+            "output_data": {},
+            "cost_usd": 0.0,
+            "duration_seconds": duration_seconds,
+            "error_message": str(e)
+        }
+    
+    finally:
+        if plan_lock_key:
+            redis_client.release_plan_lock(plan_lock_key)
 
 
 # ===== Model-Specific Planning Functions =====
@@ -179,40 +291,226 @@ def plan_with_gpt4o_mini(
     """
     
     # Build prompts (gpt-4o-mini supports system messages)
-    system_prompt = build_gpt4_system_prompt(reference_context)
-    user_message = f"Create a video advertisement: {prompt}"
-    
-    logger.info(f"   Calling gpt-4o-mini with structured outputs...")
-    
-    # Call gpt-4o-mini with Structured Outputs using responses API
-    response = openai_client.client.responses.parse(
-        model="gpt-4o-mini",
-        input=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_message}
-        ],
-        text_format=VideoPlanning
+    messages = build_planning_messages(prompt, reference_context)
+    
+    try:
+        llm_output, cost = _request_primary_plan(messages, start_time)
+    except Exception:
+        primary_breaker.record_failure()
+        raise
+    primary_breaker.record_success()
+    
+    return _finalize_plan(
+        video_id, prompt, creativity_level, llm_output, PHASE1_PRIMARY_MODEL, cost,
+        start_time, reference_context, phase0_output
     )
+
+
+def plan_with_gpt4o(
+    video_id: str,
+    prompt: str,
+    creativity_level: float,
+    start_time: float,
+    reference_context: dict = None,
+    phase0_output: dict = None
+) -> dict:
+    """
+    Plan video using gpt-4o with Structured Outputs (fallback or direct use).
     
-    # Get parsed output (automatically validated by Pydantic)
-    llm_output = response.output_parsed
+    Same Responses API path as the primary; only the model and the
+    creativity-driven temperature differ.
+    """
     
-    if llm_output is None:
-        logger.error(f"   o1-preview returned None output")
+    # Build separate system and user prompts
+    messages = build_planning_messages(prompt, reference_context)
+    
+    llm_output, cost = _request_fallback_plan(messages, creativity_level, start_time)
+    
+    return _finalize_plan(
+        video_id, prompt, creativity_level, llm_output, PHASE1_FALLBACK_MODEL, cost,
+        start_time, reference_context, phase0_output
+    )
+
+
+def _request_primary_plan(messages: list, start_time: float):
+    """gpt-4o-mini planning call only (no breaker/cache side effects) -> (VideoPlanning, cost)"""
+    # Primary retries stop early enough to leave one full fallback attempt in the budget
+    llm_output, usage = _parse_plan(
+        openai_client.client,
+        PHASE1_PRIMARY_MODEL,
+        messages,
+        deadline=_task_deadline(start_time) - PHASE1_TIMEOUT,
+        max_retries=PHASE1_MAX_RETRIES
+    )
+    
+    # Calculate actual cost (gpt-4o-mini pricing: $0.15/$0.60 per 1M tokens)
+    if usage:
+        cost = (usage.input_tokens * 0.00000015) + (usage.output_tokens * 0.0000006)
+    else:
+        cost = 0.001  # Estimate if usage not available
+    
+    return llm_output, cost
+
+
+def _request_fallback_plan(messages: list, creativity_level: float, start_time: float):
+    """gpt-4o planning call only (no cache side effects) -> (VideoPlanning, cost)"""
+    # Calculate temperature
+    temperature = get_planning_temperature(creativity_level)
+    logger.info(f"   Temperature: {temperature}")
+    
+    llm_output, usage = _parse_plan(
+        openai_client.client,
+        PHASE1_FALLBACK_MODEL,
+        messages,
+        deadline=_task_deadline(start_time),
+        max_retries=FALLBACK_MAX_RETRIES,
+        temperature=temperature
+    )
+    
+    # Calculate actual cost (gpt-4o: $2.50/$10 per 1M tokens)
+    if usage:
+        cost = (usage.input_tokens * 0.0000025) + (usage.output_tokens * 0.000010)
+    else:
+        cost = 0.01  # Estimate if usage not available
+    
+    return llm_output, cost
+
+
+def _parse_plan(client, model: str, messages: list, deadline: float, max_retries: int, **params):
+    """
+    Call `model` through the Responses API with Structured Outputs and return
+    (validated VideoPlanning, usage).
+    
+    The response is constrained server-side to the VideoPlanning JSON schema, so
+    malformed JSON can't come back and force another full LLM call. A response cut
+    off by max_output_tokens is retried once on the same model with double the cap
+    (a fallback model would hit the same cap); other incomplete responses raise.
+    The call (retries included) ends by `deadline` (a time.perf_counter() value).
+    """
+    logger.info(f"   Calling {model} with structured outputs...")
+    
+    max_output_tokens = PHASE1_MAX_OUTPUT_TOKENS
+    retried_truncation = False
+    while True:
+        # responses.create with the pre-built strict schema instead of responses.parse(text_format=...),
+        # which re-derives the schema from VideoPlanning on every call
+        response = _create_with_deadline(
+            client,
+            deadline,
+            max_retries,
+            model=model,
+            input=messages,
+            text={"format": _planning_text_format()},
+            max_output_tokens=max_output_tokens,
+            **params
+        )
+        if getattr(response, 'status', None) != 'incomplete':
+            break
+        
+        reason = getattr(response.incomplete_details, 'reason', None)
+        if reason != 'max_output_tokens' or retried_truncation or max_output_tokens >= _MAX_OUTPUT_TOKENS_CEILING:
+            raise PhaseException(
+                f"{model} returned an incomplete plan (reason={reason}, max_output_tokens={max_output_tokens})"
+            )
+        logger.warning(
+            "   %s plan truncated at max_output_tokens=%d - retrying with a larger cap",
+            model, max_output_tokens
+        )
+        max_output_tokens = min(max_output_tokens * 2, _MAX_OUTPUT_TOKENS_CEILING)
+        retried_truncation = True
+    
+    if not response.output_text:
+        logger.error(f"   {model} returned None output")
         raise ValueError(f"Model returned None output")
     
+    # Validate into VideoPlanning (raises on truncated/incomplete JSON)
+    llm_output = VideoPlanning.model_validate_json(response.output_text)
+    
     # Log token usage
-    if hasattr(response, 'usage') and response.usage:
-        logger.info(f"   gpt-4o-mini completed:")
-        logger.info(f"     Input tokens: {response.usage.input_tokens}")
-        logger.info(f"     Output tokens: {response.usage.output_tokens}")
-        logger.info(f"     Total tokens: {response.usage.total_tokens}")
+    usage = getattr(response, 'usage', None)
+    if usage:
+        logger.info(f"   {model} completed:")
+        logger.info(f"     Input tokens: {usage.input_tokens}")
+        logger.info(f"     Cached input tokens: {_cached_tokens(usage.input_tokens_details)}")
+        logger.info(f"     Output tokens: {usage.output_tokens}")
+        logger.info(f"     Total tokens: {usage.total_tokens}")
+    
+    return llm_output, usage
+
+
+def _task_deadline(start_time: float) -> float:
+    """perf_counter() time by which a task started at start_time must be done calling the API"""
+    return start_time + PHASE1_SOFT_TIME_LIMIT - _DEADLINE_MARGIN
+
+
+def _create_with_deadline(client, deadline: float, max_retries: int, **request):
+    """
+    client.responses.create with retries, bounded by a time.perf_counter() deadline.
     
-    # Convert Pydantic model to dict for processing
-    llm_output_dict = llm_output.model_dump()
+    Retries the same errors as the OpenAI SDK (connection errors/timeouts, 408/409/429/5xx)
+    with its backoff and Retry-After handling, but each attempt's timeout is capped by the
+    time left and no attempt starts past the deadline - so a hung API can't hold the task
+    beyond its budget on any worker pool.
     
-    logger.info(f"📄 RAW LLM OUTPUT (gpt-4o-mini):")
-    logger.info(json.dumps(llm_output_dict, indent=2))
+    Raises:
+        PhaseException: If the deadline has already passed
+    """
+    for attempt in range(max_retries + 1):
+        remaining = deadline - time.perf_counter()
+        if remaining < _MIN_ATTEMPT_SECONDS:
+            raise PhaseException(f"Phase 1 time budget exhausted before calling {request.get('model')}")
+        
+        try:
+            return client.with_options(
+                max_retries=0,
+                timeout=min(PHASE1_TIMEOUT, remaining)
+            ).responses.create(**request)
+        except (openai.APIConnectionError, openai.APIStatusError) as e:
+            status_code = getattr(e, 'status_code', None)
+            if status_code is not None and status_code not in (408, 409, 429) and status_code < 500:
+                raise
+            delay = _retry_delay(attempt, e)
+            if attempt == max_retries or time.perf_counter() + delay + _MIN_ATTEMPT_SECONDS > deadline:
+                raise
+            logger.warning(
+                "   %s attempt %d failed (%s) - retrying in %.1fs",
+                request.get('model'), attempt + 1, e, delay
+            )
+            time.sleep(delay)
+
+
+def _retry_delay(attempt: int, error: Exception) -> float:
+    """Seconds before retry number attempt+1: Retry-After if sensible, else the SDK's backoff"""
+    response = getattr(error, 'response', None)
+    try:
+        retry_after = float(response.headers.get('retry-after')) if response is not None else None
+    except (TypeError, ValueError):
+        retry_after = None
+    if retry_after is not None and 0 < retry_after <= 60:
+        return retry_after
+    return min(0.5 * 2 ** attempt, 8.0) * (1 - 0.25 * random.random())
+
+
+def _finalize_plan(
+    video_id: str,
+    prompt: str,
+    creativity_level: float,
+    llm_output: VideoPlanning,
+    model_used: str,
+    cost: float,
+    start_time: float,
+    reference_context: dict = None,
+    phase0_output: dict = None
+) -> dict:
+    """
+    Shared post-LLM step for every planning model: normalize the parsed plan,
+    cache it, and build the validated spec / PhaseOutput.
+    """
+    # Convert Pydantic model to dict for processing (skips the free-text reasoning
+    # fields nothing downstream reads - they stay on llm_output for DEBUG logging)
+    llm_output_dict = llm_output.model_dump(exclude=_REASONING_FIELDS)
+    
+    _log_json_debug(f"📄 RAW LLM OUTPUT ({model_used}):", llm_output)
     
     # Log planning results
     logger.info(f"   LLM selected archetype: {llm_output.selected_archetype}")
@@ -228,8 +526,36 @@ def plan_with_gpt4o_mini(
     if llm_output.scene_requirements:
         logger.info(f"   Scene requirements: {len(llm_output.scene_requirements)} beats have specific requirements")
     
-    # Extract reference_mapping if present
-    reference_mapping = llm_output_dict.get('reference_mapping', {})
+    # Validate and fix beat durations (ensures 5/10/15s only)
+    llm_output_dict = validate_llm_beat_durations(llm_output_dict)
+    
+    result = _build_plan_output(
+        video_id, llm_output_dict, model_used, cost, start_time, reference_context, phase0_output
+    )
+    
+    # Only plans that passed validate_spec reach the cache
+    if PLAN_CACHE_ENABLED:
+        redis_client.set_cached_plan(_plan_cache_key(prompt, creativity_level, reference_context), llm_output_dict)
+    
+    return result
+
+
+def _build_plan_output(
+    video_id: str,
+    llm_output_dict: dict,
+    model_used: str,
+    cost: float,
+    start_time: float,
+    reference_context: dict = None,
+    phase0_output: dict = None,
+    cache_hit: bool = False
+) -> dict:
+    """
+    Build and validate the full spec from a normalized LLM planning output and
+    wrap it in a success PhaseOutput (shared by fresh and cached plans).
+    """
+    # Extract reference_mapping if present (model_dump keeps unset optionals as None)
+    reference_mapping = llm_output_dict.get('reference_mapping') or {}
     if reference_mapping:
         logger.info(f"   LLM generated reference_mapping for {len(reference_mapping)} beats")
     
@@ -237,53 +563,43 @@ def plan_with_gpt4o_mini(
     if reference_context and reference_context.get('has_assets'):
         validate_reference_asset_usage(reference_mapping, reference_context)
     
-    # Validate and fix beat durations (ensures 5/10/15s only)
-    llm_output_dict = validate_llm_beat_durations(llm_output_dict)
-    
     # Build full spec from LLM output
     spec = build_full_spec(llm_output_dict, video_id)
     
-    logger.info(f"📄 BUILT SPEC (gpt-4o-mini):")
-    logger.info(json.dumps(spec, indent=2))
+    _log_json_debug(f"📄 BUILT SPEC ({model_used}):", spec)
     
     # Validate spec meets all constraints
     validate_spec(spec)
     
-    # Calculate actual cost (gpt-4o-mini pricing: $0.15/$0.60 per 1M tokens)
-    if hasattr(response, 'usage') and response.usage:
-        input_tokens = response.usage.input_tokens
-        output_tokens = response.usage.output_tokens
-        cost = (input_tokens * 0.00000015) + (output_tokens * 0.0000006)
-    else:
-        cost = 0.001  # Estimate if usage not available
-    
     # Calculate duration
-    duration_seconds = time.time() - start_time
+    duration_seconds = time.perf_counter() - start_time
     
     logger.info(f"✅ Phase 1 complete for video {video_id}")
-    logger.info(f"   Cost: ${cost:.4f} (gpt-4o-mini)")
+    logger.info(f"   Cost: ${cost:.4f} ({model_used})")
     logger.info(f"   Duration: {duration_seconds:.2f}s")
     logger.info(f"   Total video duration: {spec['duration']}s")
     logger.info(f"   Beats: {len(spec['beats'])}")
     
-    # Success - return PhaseOutput
-    return PhaseOutput(
-        video_id=video_id,
-        phase="phase1_planning",
-        status="success",
-        output_data={
+    # Success - return the PhaseOutput fields as a plain dict (model_dump would
+    # re-validate and deep-copy the whole spec just to hand Celery a dict)
+    return {
+        "video_id": video_id,
+        "phase": "phase1_planning",
+        "status": "success",
+        "output_data": {
             "spec": spec,
             "reference_mapping": reference_mapping,
-            "model_used": "gpt-4o-mini",
+            "model_used": model_used,
+            "cache_hit": cache_hit,
             "phase0_output": phase0_output  # Pass Phase 0 output for Phase 2
         },
-        cost_usd=cost,
-        duration_seconds=duration_seconds,
-        error_message=None
-    ).dict()
+        "cost_usd": cost,
+        "duration_seconds": duration_seconds,
+        "error_message": None
+    }
 
 
-def plan_with_gpt4_turbo(
+def plan_hedged(
     video_id: str,
     prompt: str,
     creativity_level: float,
@@ -292,105 +608,255 @@ def plan_with_gpt4_turbo(
     phase0_output: dict = None
 ) -> dict:
     """
-    Plan video using gpt-4-turbo-preview with JSON mode (fallback or direct use).
+    Plan with gpt-4o-mini, hedged by gpt-4o if it hasn't answered within PHASE1_HEDGE_DELAY.
     
-    Uses traditional JSON mode since gpt-4-turbo-preview doesn't support structured outputs.
+    The fallback starts immediately if the primary fails before the delay. Only the API
+    calls race in the pool; breaker updates, spec validation and the plan cache happen
+    here, for the first successful plan only. Running HTTP requests can't be cancelled,
+    so the losing call finishes in the background with no side effects other than
+    adding its cost to the video (update_cost). Wins are counted per model in Redis.
     """
+    messages = build_planning_messages(prompt, reference_context)
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="phase1-hedge")
+    wasted_cost = 0.0  # Spend on finished calls whose plan wasn't used
     
-    # Build separate system and user prompts
-    system_prompt = build_gpt4_system_prompt(reference_context)
-    user_message = f"Create a video advertisement: {prompt}"
-    
-    # Calculate temperature
-    temperature = get_planning_temperature(creativity_level)
-    
-    logger.info(f"   Calling gpt-4-turbo-preview with JSON mode...")
-    logger.info(f"   Temperature: {temperature}")
+    try:
+        primary = executor.submit(_request_primary_plan, messages, start_time)
+        names = {primary: PHASE1_PRIMARY_MODEL}
+        pending = {primary}
+        handled = set()
+        
+        def start_hedge():
+            hedge = executor.submit(_request_fallback_plan, messages, creativity_level, start_time)
+            names[hedge] = PHASE1_FALLBACK_MODEL
+            pending.add(hedge)
+        
+        wait([primary], timeout=PHASE1_HEDGE_DELAY)
+        if not primary.done():
+            logger.info(f"⏱️  {PHASE1_PRIMARY_MODEL} slower than {PHASE1_HEDGE_DELAY}s - hedging with {PHASE1_FALLBACK_MODEL}")
+            start_hedge()
+        
+        last_error = None
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                handled.add(future)
+                model = names[future]
+                error = future.exception()
+                if future is primary:
+                    if error is None:
+                        primary_breaker.record_success()
+                    else:
+                        primary_breaker.record_failure()
+                if error is not None:
+                    logger.error(f"❌ {model} failed: {error}")
+                    last_error = error
+                    if len(names) == 1:
+                        start_hedge()
+                    continue
+                
+                llm_output, cost = future.result()
+                try:
+                    result = _finalize_plan(
+                        video_id, prompt, creativity_level, llm_output, model, cost,
+                        start_time, reference_context, phase0_output
+                    )
+                except Exception as e:
+                    logger.error(f"❌ {model} plan rejected: {e}")
+                    wasted_cost += cost
+                    last_error = e
+                    if len(names) == 1:
+                        start_hedge()
+                    continue
+                
+                logger.info(f"🏁 Hedged planning won by {model}")
+                redis_client.record_phase1_hedge_win(model)
+                result['cost_usd'] += wasted_cost
+                for loser in names.keys() - handled:
+                    loser.add_done_callback(
+                        lambda f, loser_model=names[loser]: _record_hedge_loser_cost(video_id, loser_model, f)
+                    )
+                return result
+        
+        raise last_error
+    finally:
+        executor.shutdown(wait=False)
+
+
+def _record_hedge_loser_cost(video_id: str, model: str, future) -> None:
+    """Add a losing hedged call's spend to the video's cost breakdown once it finishes"""
+    if future.cancelled() or future.exception() is not None:
+        return
+    _, cost = future.result()
+    logger.info(f"   Hedge loser {model} finished - recording ${cost:.4f}")
+    try:
+        update_cost(video_id, "phase1_hedge", cost)
+    except Exception as e:
+        logger.warning(f"Failed to record Phase 1 hedge cost: {e}")
+
+
+def plan_from_cache(
+    video_id: str,
+    llm_output_dict: dict,
+    start_time: float,
+    reference_context: dict = None,
+    phase0_output: dict = None
+) -> dict:
+    """
+    Build the spec from a cached LLM planning output (plan cache hit, no API call).
     
-    # Call gpt-4-turbo-preview with traditional JSON mode (not structured outputs)
-    response = openai_client.chat.completions.create(
-        model="gpt-4-turbo-preview",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_message}
-        ],
-        response_format={"type": "json_object"},
-        temperature=temperature
+    Cached outputs were already normalized before being stored - just rebuild the spec.
+    """
+    return _build_plan_output(
+        video_id, llm_output_dict, "plan_cache", 0.0, start_time, reference_context, phase0_output,
+        cache_hit=True
     )
+
+
+def _wait_for_cached_plan(cache_key: str, timeout: float, poll_interval: float = 0.5):
+    """
+    Poll the plan cache for a plan another task is producing.
     
-    # Parse JSON response
-    llm_output_dict = json.loads(response.choices[0].message.content)
-    
-    logger.info(f"📄 RAW LLM OUTPUT (gpt-4-turbo-preview):")
-    logger.info(json.dumps(llm_output_dict, indent=2))
-    
-    # Log planning results
-    logger.info(f"   LLM selected archetype: {llm_output_dict.get('selected_archetype')}")
-    logger.info(f"   LLM composed {len(llm_output_dict.get('beat_sequence', []))} beats")
-    
-    # Log extracted/inferred fields
-    if llm_output_dict.get('brand_name'):
-        logger.info(f"   Brand name: {llm_output_dict['brand_name']}")
-    if llm_output_dict.get('music_theme'):
-        logger.info(f"   Music theme: {llm_output_dict['music_theme']}")
-    if llm_output_dict.get('color_scheme'):
-        logger.info(f"   Color scheme: {llm_output_dict['color_scheme']}")
-    if llm_output_dict.get('scene_requirements'):
-        logger.info(f"   Scene requirements: {len(llm_output_dict['scene_requirements'])} beats have specific requirements")
-    
-    # Extract reference_mapping if present
-    reference_mapping = llm_output_dict.get('reference_mapping', {})
-    if reference_mapping:
-        logger.info(f"   LLM generated reference_mapping for {len(reference_mapping)} beats")
-    
-    # Validate reference asset usage if user has assets
-    if reference_context and reference_context.get('has_assets'):
-        validate_reference_asset_usage(reference_mapping, reference_context)
+    Returns None if it doesn't show up within timeout (e.g. that task failed),
+    in which case the caller just plans itself.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        cached_output = redis_client.get_cached_plan(cache_key)
+        if cached_output:
+            return cached_output
+        if not redis_client.plan_lock_held(cache_key):
+            # Owner finished without caching a plan (failed) - stop waiting
+            return redis_client.get_cached_plan(cache_key)
+    return None
+
+
+def _plan_cache_key(prompt: str, creativity_level: float, reference_context: dict = None) -> str:
+    """
+    Plan cache key: normalized prompt + creativity + recommended asset IDs
+    (reference_mapping embeds asset IDs, so plans are only reusable for the same assets),
+    plus a digest of the static system prompt so a deploy that changes the beat library,
+    archetypes or instructions never serves plans made against the old prompt.
+    """
+    reference_context = reference_context or {}
+    product = reference_context.get('recommended_product') or {}
+    logo = reference_context.get('recommended_logo') or {}
+    normalized_prompt = ' '.join(prompt.lower().split())
+    raw = (
+        f"{_static_system_prompt_digest()}|{normalized_prompt}|{creativity_level}|"
+        f"{product.get('asset_id')}|{logo.get('asset_id')}"
+    )
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+@cache
+def _static_system_prompt_digest() -> str:
+    """Short, stable fingerprint of the static system prompt (plan cache versioning)"""
+    return hashlib.sha256(_get_static_system_prompt().encode('utf-8')).hexdigest()[:16]
+
+
+@cache
+def _planning_text_format() -> dict:
+    """
+    Strict json_schema text format for VideoPlanning, built once per process
+    (responses.parse(text_format=...) re-derives it from the model on every call).
+    """
+    schema = VideoPlanning.model_json_schema()
+    return {
+        "type": "json_schema",
+        "name": VideoPlanning.__name__,
+        "strict": True,
+        "schema": _to_strict_json_schema(schema, schema),
+    }
+
+
+def _to_strict_json_schema(schema: dict, root: dict) -> dict:
+    """
+    Rewrite a pydantic JSON schema (in place) into the subset Structured Outputs
+    accepts in strict mode: every object closed and with all properties required,
+    no null defaults, and no `$ref` that carries sibling keys.
+    """
+    for def_schema in schema.get('$defs', {}).values():
+        _to_strict_json_schema(def_schema, root)
     
-    # Validate and fix beat durations
-    llm_output_dict = validate_llm_beat_durations(llm_output_dict)
+    if schema.get('type') == 'object' and 'additionalProperties' not in schema:
+        schema['additionalProperties'] = False
     
-    # Build full spec
-    spec = build_full_spec(llm_output_dict, video_id)
+    properties = schema.get('properties')
+    if isinstance(properties, dict):
+        schema['required'] = list(properties)
+        for key, prop_schema in properties.items():
+            properties[key] = _to_strict_json_schema(prop_schema, root)
     
-    logger.info(f"📄 BUILT SPEC (gpt-4-turbo-preview):")
-    logger.info(json.dumps(spec, indent=2))
+    if isinstance(schema.get('items'), dict):
+        schema['items'] = _to_strict_json_schema(schema['items'], root)
     
-    # Validate spec
-    validate_spec(spec)
+    if isinstance(schema.get('anyOf'), list):
+        schema['anyOf'] = [_to_strict_json_schema(variant, root) for variant in schema['anyOf']]
     
-    # Calculate actual cost (gpt-4-turbo-preview: $10/$30 per 1M tokens)
-    if hasattr(response, 'usage') and response.usage:
-        input_tokens = response.usage.prompt_tokens
-        output_tokens = response.usage.completion_tokens
-        cost = (input_tokens * 0.000010) + (output_tokens * 0.000030)
-    else:
-        cost = 0.02  # Estimate if usage not available
+    all_of = schema.get('allOf')
+    if isinstance(all_of, list):
+        if len(all_of) == 1:
+            schema.update(_to_strict_json_schema(schema.pop('allOf')[0], root))
+        else:
+            schema['allOf'] = [_to_strict_json_schema(entry, root) for entry in all_of]
+    
+    if 'default' in schema and schema['default'] is None:
+        del schema['default']
+    
+    # `$ref` can't have siblings (e.g. a description) - inline the referenced definition
+    ref = schema.get('$ref')
+    if ref and len(schema) > 1:
+        resolved = root
+        for key in ref.removeprefix('#/').split('/'):
+            resolved = resolved[key]
+        schema.update({**resolved, **schema})
+        del schema['$ref']
+        return _to_strict_json_schema(schema, root)
+    
+    return schema
+
+
+@worker_init.connect
+def _warm_planning_caches(**kwargs):
+    """
+    Build the per-process planning caches at worker boot, so the first task
+    doesn't pay for prompt assembly and schema generation.
     
-    # Calculate duration
-    duration_seconds = time.time() - start_time
+    worker_init fires before the prefork pool forks (children inherit the primed
+    caches) and once in gevent/solo workers; the API process never sees it.
+    """
+    _get_static_system_prompt()
+    _static_system_prompt_digest()
+    _planning_text_format()
+    logger.info("✓ Phase 1 planning caches warmed")
+
+
+def _cached_tokens(token_details) -> int:
+    """
+    Input tokens served from OpenAI's prompt cache (0 if not reported).
     
-    logger.info(f"✅ Phase 1 complete for video {video_id}")
-    logger.info(f"   Cost: ${cost:.4f} (gpt-4-turbo-preview)")
-    logger.info(f"   Duration: {duration_seconds:.2f}s")
-    logger.info(f"   Total video duration: {spec['duration']}s")
-    logger.info(f"   Beats: {len(spec['beats'])}")
+    Confirms the static system prompt prefix is actually being reused.
+    """
+    return getattr(token_details, 'cached_tokens', None) or 0
+
+
+def _log_json_debug(label: str, obj):
+    """
+    Dump a multi-KB plan/spec (dict or Pydantic model) at DEBUG level only.
     
-    # Success - return PhaseOutput
-    return PhaseOutput(
-        video_id=video_id,
-        phase="phase1_planning",
-        status="success",
-        output_data={
-            "spec": spec,
-            "reference_mapping": reference_mapping,
-            "model_used": "gpt-4-turbo-preview",
-            "phase0_output": phase0_output  # Pass Phase 0 output for Phase 2
-        },
-        cost_usd=cost,
-        duration_seconds=duration_seconds,
-        error_message=None
-    ).dict()
+    Serialization is skipped entirely unless DEBUG is enabled; output is compact
+    unless LOG_PRETTY_JSON is set.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    if hasattr(obj, 'model_dump'):
+        obj = obj.model_dump()
+    logger.debug(label)
+    option = orjson.OPT_INDENT_2 if LOG_PRETTY_JSON else 0
+    logger.debug(orjson.dumps(obj, option=option).decode())
 
 
 # ===== Prompt Builders =====
@@ -414,20 +880,18 @@ def validate_reference_asset_usage(reference_mapping: dict, reference_context: d
     # Build asset ID lookup
     valid_asset_ids = {asset['asset_id'] for asset in user_assets}
     
-    # Check if referenced assets exist
+    # Single pass: flag unknown asset IDs and collect every ID the mapping uses
+    used_asset_ids = set()
     for beat_id, mapping in reference_mapping.items():
         asset_ids = mapping.get('asset_ids', [])
+        used_asset_ids.update(asset_ids)
         for asset_id in asset_ids:
             if asset_id not in valid_asset_ids:
                 logger.warning(f"   ⚠️  Beat '{beat_id}' references unknown asset '{asset_id}'")
     
     # Check if product was used (if available)
     if recommended_product:
-        product_id = recommended_product['asset_id']
-        product_used = any(
-            product_id in mapping.get('asset_ids', [])
-            for mapping in reference_mapping.values()
-        )
+        product_used = recommended_product['asset_id'] in used_asset_ids
         if not product_used:
             logger.warning(f"   ⚠️  Recommended product '{recommended_product.get('name')}' was NOT used in any beat")
             logger.warning(f"       This is an advertising app - products should be featured!")
@@ -436,11 +900,7 @@ def validate_reference_asset_usage(reference_mapping: dict, reference_context: d
     
     # Check if logo was used in closing (if available)
     if recommended_logo:
-        logo_id = recommended_logo['asset_id']
-        logo_used = any(
-            logo_id in mapping.get('asset_ids', [])
-            for mapping in reference_mapping.values()
-        )
+        logo_used = recommended_logo['asset_id'] in used_asset_ids
         if not logo_used:
             logger.warning(f"   ⚠️  Recommended logo '{recommended_logo.get('name')}' was NOT used in any beat")
             logger.warning(f"       Logos should ALWAYS appear in closing beats for brand reinforcement!")
@@ -469,16 +929,35 @@ def build_reference_asset_guidelines(reference_context: dict) -> str:
     logo_id = recommended_logo.get('asset_id') if recommended_logo else None
     logo_name = recommended_logo.get('name', 'Logo') if recommended_logo else None
     
+    section = _reference_asset_section(product_id, logo_id, product_name, logo_name)
+    
+    logger.info("📋 Built reference asset guidelines section")
+    logger.debug("%s", section)
+    
+    return section
+
+
+@lru_cache(maxsize=256)
+def _reference_asset_section(product_id, logo_id, product_name, logo_name) -> str:
+    """
+    Render the REFERENCE ASSETS prompt section (cached - the same user assets
+    recur across retries and the fallback call).
+    
+    product_name/logo_name are None exactly when that asset wasn't recommended.
+    """
+    has_product = product_name is not None
+    has_logo = logo_name is not None
+    
     # Build example mapping parts
-    product_example = f'    "hero_shot": {{\n      "asset_ids": ["{product_id}"],\n      "usage_type": "product",\n      "rationale": "Hero shot showcases the product"\n    }}' if recommended_product else ''
-    logo_example = f'    "call_to_action": {{\n      "asset_ids": ["{logo_id}"],\n      "usage_type": "logo",\n      "rationale": "Closing beat includes brand logo"\n    }}' if recommended_logo else ''
-    comma = ',' if (recommended_product and recommended_logo) else ''
+    product_example = f'    "hero_shot": {{\n      "asset_ids": ["{product_id}"],\n      "usage_type": "product",\n      "rationale": "Hero shot showcases the product"\n    }}' if has_product else ''
+    logo_example = f'    "call_to_action": {{\n      "asset_ids": ["{logo_id}"],\n      "usage_type": "logo",\n      "rationale": "Closing beat includes brand logo"\n    }}' if has_logo else ''
+    comma = ',' if (has_product and has_logo) else ''
     
-    section = f"""
+    return f"""
 ===== REFERENCE ASSETS =====
 
-{'' if not recommended_product else f"User has uploaded product '{product_name}' (ID: {product_id}) - decide when/if to include in beats using reference_mapping."}
-{'' if not recommended_logo else f"User has uploaded logo '{logo_name}' (ID: {logo_id}) - always include in closing beats using reference_mapping."}
+{'' if not has_product else f"User has uploaded product '{product_name}' (ID: {product_id}) - decide when/if to include in beats using reference_mapping."}
+{'' if not has_logo else f"User has uploaded logo '{logo_name}' (ID: {logo_id}) - always include in closing beats using reference_mapping."}
 
 **CRITICAL: reference_mapping Structure**
 Keys MUST be beat_ids from your beat_sequence (e.g., 'hero_shot', 'dynamic_intro'), NOT asset IDs.
@@ -493,39 +972,13 @@ Keys MUST be beat_ids from your beat_sequence (e.g., 'hero_shot', 'dynamic_intro
 }}
 ```
 """
-    
-    logger.info("📋 Built reference asset guidelines section:")
-    logger.info(section)
-    
-    return section
-
-
-def build_gpt4_system_prompt(reference_context: dict = None) -> str:
-    """
-    Build system prompt for GPT-4 Turbo (kept separate from user message).
-    
-    Args:
-        reference_context: Optional dict containing Phase 0 reference asset information
-    """
-    
-    # Build reference asset section if available
-    reference_section = ""
-    if reference_context and reference_context.get('has_assets'):
-        reference_section = build_reference_asset_guidelines(reference_context)
-    
-    return f"""You are a professional video director and creative strategist. Your job is to plan a complete video advertisement based on the user's request.
-
-{reference_section}
 
-===== AVAILABLE TEMPLATE ARCHETYPES =====
-
-{json.dumps(TEMPLATE_ARCHETYPES, indent=2)}
-
-===== AVAILABLE BEATS =====
 
-{json.dumps(BEAT_LIBRARY, indent=2)}
+# Static parts of the planning system prompt - every call sends a byte-identical
+# prefix (eligible for OpenAI prompt caching)
+_SYSTEM_PROMPT_PREAMBLE = "You are a professional video director and creative strategist. Your job is to plan a complete video advertisement based on the user's request."
 
-===== YOUR TASK =====
+_PLANNING_INSTRUCTIONS = """===== YOUR TASK =====
 
 Given the user's prompt, you must:
 
@@ -625,3 +1078,53 @@ If validation fails, adjust your beat sequence until it passes.
 
 The response will be parsed as structured JSON matching the VideoPlanning schema.
 """
+
+
+def build_planning_messages(prompt: str, reference_context: dict = None) -> list:
+    """
+    Build the message list for the planning models.
+    
+    The large static system prompt (archetypes, beat library, instructions) always
+    goes first and is byte-identical across calls, so OpenAI's automatic prompt
+    caching can reuse it. Per-user reference asset guidelines follow in a second
+    system message, then the user's request.
+    
+    Args:
+        prompt: Natural language user prompt
+        reference_context: Optional dict containing Phase 0 reference asset information
+    """
+    messages = [{"role": "system", "content": _get_static_system_prompt()}]
+    
+    # Build reference asset section if available
+    if reference_context and reference_context.get('has_assets'):
+        reference_section = build_reference_asset_guidelines(reference_context)
+        if reference_section:
+            messages.append({"role": "system", "content": reference_section.strip()})
+    
+    messages.append({"role": "user", "content": f"Create a video advertisement: {prompt}"})
+    return messages
+
+
+@cache
+def _get_static_system_prompt() -> str:
+    """
+    Assemble the static system prompt once per process, on first use.
+    
+    Deferred (rather than built at import) because the API process imports this
+    module through the pipeline but never plans - only Celery workers pay for
+    serializing the archetype/beat libraries.
+    """
+    from app.common.beat_library import BEAT_LIBRARY
+    from app.common.template_archetypes import TEMPLATE_ARCHETYPES
+    
+    return f"""{_SYSTEM_PROMPT_PREAMBLE}
+
+===== AVAILABLE TEMPLATE ARCHETYPES =====
+
+{orjson.dumps(TEMPLATE_ARCHETYPES, option=orjson.OPT_INDENT_2).decode()}
+
+===== AVAILABLE BEATS =====
+
+{orjson.dumps(BEAT_LIBRARY, option=orjson.OPT_INDENT_2).decode()}
+
+{_PLANNING_INSTRUCTIONS}"""
@@ -1,28 +1,38 @@
-import json
+import orjson
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict
 
 TEMPLATES_DIR = Path(__file__).parent
 
+# Available templates (listing order preserved; set for O(1) membership checks)
+_TEMPLATE_NAMES = (
+    "product_showcase",
+    "lifestyle_ad",
+    "announcement"
+)
+_TEMPLATES = frozenset(_TEMPLATE_NAMES)
+
 def load_template(template_name: str) -> Dict:
     """Load template JSON file"""
+    # Parse a fresh dict on every call so callers can't mutate a shared cached copy
+    return orjson.loads(_read_template(template_name))
+
+@lru_cache(maxsize=8)
+def _read_template(template_name: str) -> bytes:
+    """Read a template file once per process (templates ship with the code)"""
     template_path = TEMPLATES_DIR / f"{template_name}.json"
-    
+
     if not template_path.exists():
         raise ValueError(f"Template '{template_name}' not found")
-    
-    with open(template_path, 'r') as f:
-        return json.load(f)
+
+    with open(template_path, 'rb') as f:
+        return f.read()
 
 def list_templates() -> list:
     """List available templates"""
-    return [
-        "product_showcase",
-        "lifestyle_ad",
-        "announcement"
-    ]
+    return list(_TEMPLATE_NAMES)
 
 def validate_template_choice(template_name: str) -> bool:
     """Check if template exists"""
-    return template_name in list_templates()
-
+    return template_name in _TEMPLATES
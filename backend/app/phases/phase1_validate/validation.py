@@ -11,7 +11,7 @@ from app.common.beat_library import BEAT_LIBRARY, OPENING_BEATS, CLOSING_BEATS
 logger = logging.getLogger(__name__)
 
 # Allowed beat durations
-ALLOWED_BEAT_DURATIONS = {5, 10, 15}
+ALLOWED_BEAT_DURATIONS = frozenset({5, 10, 15})
 
 
 def validate_spec(spec: dict) -> None:
@@ -39,60 +39,57 @@ def validate_spec(spec: dict) -> None:
     if not beats:
         raise ValueError("Spec must contain at least one beat")
     
-    # Check 2: Duration sums correctly
-    total = sum(b['duration'] for b in beats)
-    if total != duration:
-        raise ValueError(
-            f"Beat durations sum to {total}s, expected {duration}s. "
-            f"Difference: {abs(total - duration)}s"
-        )
-    
-    # Check 3: All beat durations valid (5, 10, or 15 seconds)
+    # Checks 2-4 in a single pass: every beat duration is 5, 10, or 15 seconds,
+    # every beat_id exists in BEAT_LIBRARY, and the durations sum to the total
+    total = 0
     for beat in beats:
-        if beat['duration'] not in [5, 10, 15]:
+        beat_id = beat.get('beat_id')
+        beat_duration = beat['duration']
+        if beat_duration not in ALLOWED_BEAT_DURATIONS:
             raise ValueError(
-                f"Beat '{beat['beat_id']}' has invalid duration {beat['duration']}s "
+                f"Beat '{beat_id}' has invalid duration {beat_duration}s "
                 f"(must be 5, 10, or 15)"
             )
-    
-    # Check 4: All beat_ids exist in BEAT_LIBRARY
-    for beat in beats:
-        beat_id = beat.get('beat_id')
         if beat_id not in BEAT_LIBRARY:
             raise ValueError(
                 f"Unknown beat_id: '{beat_id}'. "
                 f"Must be one of: {', '.join(BEAT_LIBRARY.keys())}"
             )
+        total += beat_duration
+    
+    if total != duration:
+        raise ValueError(
+            f"Beat durations sum to {total}s, expected {duration}s. "
+            f"Difference: {abs(total - duration)}s"
+        )
     
     # Warning: First beat should be from opening beats
-    if beats:
-        first_beat_id = beats[0].get('beat_id')
-        if first_beat_id not in OPENING_BEATS:
-            logger.warning(
-                f"First beat '{first_beat_id}' is not from opening beats. "
-                f"Consider using: {', '.join(OPENING_BEATS.keys())}"
-            )
+    first_beat_id = beats[0].get('beat_id')
+    if first_beat_id not in OPENING_BEATS:
+        logger.warning(
+            "First beat '%s' is not from opening beats. Consider using: %s",
+            first_beat_id, ', '.join(OPENING_BEATS.keys())
+        )
     
     # Warning: Last beat should be from closing beats
-    if beats:
-        last_beat_id = beats[-1].get('beat_id')
-        if last_beat_id not in CLOSING_BEATS:
-            logger.warning(
-                f"Last beat '{last_beat_id}' is not from closing beats. "
-                f"Consider using: {', '.join(CLOSING_BEATS.keys())}"
-            )
+    last_beat_id = beats[-1].get('beat_id')
+    if last_beat_id not in CLOSING_BEATS:
+        logger.warning(
+            "Last beat '%s' is not from closing beats. Consider using: %s",
+            last_beat_id, ', '.join(CLOSING_BEATS.keys())
+        )
     
     # Check 5: Validate composed_prompt exists in each beat
     for beat in beats:
         if 'prompt' not in beat or not beat['prompt']:
             logger.warning(
-                f"Beat '{beat.get('beat_id')}' missing 'prompt' field. "
-                f"This may cause issues in Phase 2 generation."
+                "Beat '%s' missing 'prompt' field. This may cause issues in Phase 2 generation.",
+                beat.get('beat_id')
             )
         elif len(beat['prompt']) < 10:
             logger.warning(
-                f"Beat '{beat.get('beat_id')}' has very short prompt ({len(beat['prompt'])} chars). "
-                f"Prompts should be detailed (2-3 sentences recommended)."
+                "Beat '%s' has very short prompt (%d chars). Prompts should be detailed (2-3 sentences recommended).",
+                beat.get('beat_id'), len(beat['prompt'])
             )
     
     # Check 6: Validate music_theme if provided
@@ -101,23 +98,23 @@ def validate_spec(spec: dict) -> None:
         if not music_theme.strip():
             logger.warning("music_theme is empty string (should be None or valid genre/mood)")
         elif len(music_theme) > 100:
-            logger.warning(f"music_theme is very long ({len(music_theme)} chars). Should be concise genre/mood.")
+            logger.warning("music_theme is very long (%d chars). Should be concise genre/mood.", len(music_theme))
         else:
-            logger.info(f"✓ Music theme: {music_theme}")
+            logger.info("✓ Music theme: %s", music_theme)
     
     # Check 7: Validate color_scheme if provided
     if spec.get('color_scheme'):
         color_scheme = spec['color_scheme']
         if not isinstance(color_scheme, list):
-            logger.warning(f"color_scheme should be a list, got {type(color_scheme)}")
+            logger.warning("color_scheme should be a list, got %s", type(color_scheme))
         elif len(color_scheme) < 2:
-            logger.warning(f"color_scheme has only {len(color_scheme)} color(s). Recommend 3-5 colors.")
+            logger.warning("color_scheme has only %d color(s). Recommend 3-5 colors.", len(color_scheme))
         elif len(color_scheme) > 7:
-            logger.warning(f"color_scheme has {len(color_scheme)} colors. Too many - recommend 3-5.")
+            logger.warning("color_scheme has %d colors. Too many - recommend 3-5.", len(color_scheme))
         else:
-            logger.info(f"✓ Color scheme: {color_scheme}")
+            logger.info("✓ Color scheme: %s", color_scheme)
     
-    logger.info(f"✅ Spec validation passed: {len(beats)} beats, {duration}s total")
+    logger.info("✅ Spec validation passed: %d beats, %ss total", len(beats), duration)
 
 
 def validate_llm_beat_durations(llm_output: dict) -> dict:
@@ -140,8 +137,13 @@ def validate_llm_beat_durations(llm_output: dict) -> dict:
         raise ValueError("LLM output missing 'beat_sequence' field")
     
     beat_sequence = llm_output['beat_sequence']
+
+    # Fast path: the LLM almost always returns valid durations already
+    if all(beat_info.get('duration') in ALLOWED_BEAT_DURATIONS for beat_info in beat_sequence):
+        return llm_output
+
     fixed_count = 0
-    
+
     for beat_info in beat_sequence:
         original_duration = beat_info.get('duration')
         
@@ -155,16 +157,16 @@ def validate_llm_beat_durations(llm_output: dict) -> dict:
                 fixed_duration = 15
             
             logger.warning(
-                f"⚠️  LLM returned invalid beat duration: {original_duration}s "
-                f"(beat_id={beat_info.get('beat_id')}). Fixed to {fixed_duration}s"
+                "⚠️  LLM returned invalid beat duration: %ss (beat_id=%s). Fixed to %ss",
+                original_duration, beat_info.get('beat_id'), fixed_duration
             )
             beat_info['duration'] = fixed_duration
             fixed_count += 1
     
     if fixed_count > 0:
         logger.warning(
-            f"⚠️  Fixed {fixed_count} invalid beat durations from LLM output. "
-            f"All beat durations must be 5s, 10s, or 15s."
+            "⚠️  Fixed %d invalid beat durations from LLM output. All beat durations must be 5s, 10s, or 15s.",
+            fixed_count
         )
     
     return llm_output
@@ -195,6 +197,13 @@ def build_full_spec(llm_output: dict, video_id: str) -> dict:
     beat_sequence = llm_output['beat_sequence']
     style = llm_output['style']
     
+    # Template placeholder values are the same for every beat
+    template_values = {
+        "product_name": intent['product']['name'],
+        "style_aesthetic": style['aesthetic'],
+        "setting": f"{style['mood']} setting"
+    }
+    
     # Build beats with full details from library
     current_time = 0
     full_beats = []
@@ -213,27 +222,23 @@ def build_full_spec(llm_output: dict, video_id: str) -> dict:
         beat_template = BEAT_LIBRARY[beat_id]
         
         # Build full beat by copying all fields from library
-        beat = {
-            **beat_template,  # Copy all fields from library
-            "start": current_time,
-            "duration": duration  # Override with requested duration
-        }
+        # (list fields are copied too so later spec edits never reach the shared BEAT_LIBRARY)
+        beat = beat_template.copy()  # Copy all fields from library
+        beat["compatible_products"] = list(beat_template.get('compatible_products', []))
+        beat["start"] = current_time
+        beat["duration"] = duration  # Override with requested duration
         
         # Use composed_prompt from LLM if available (NEW approach)
         # Otherwise fallback to template substitution (backward compatibility)
         if 'composed_prompt' in beat_info and beat_info['composed_prompt']:
             beat['prompt'] = beat_info['composed_prompt']
-            logger.info(f"   Using LLM-composed prompt for beat '{beat_id}'")
+            logger.debug("   Using LLM-composed prompt for beat '%s'", beat_id)
         else:
             # Fallback: Fill in prompt template with actual product/style
             # Handle {product_name}, {style_aesthetic}, {setting} placeholders
-            beat['prompt_template'] = beat['prompt_template'].format(
-                product_name=intent['product']['name'],
-                style_aesthetic=style['aesthetic'],
-                setting=f"{style['mood']} setting"
-            )
+            beat['prompt_template'] = beat['prompt_template'].format(**template_values)
             beat['prompt'] = beat['prompt_template']
-            logger.warning(f"   Using template fallback for beat '{beat_id}' (composed_prompt missing)")
+            logger.warning("   Using template fallback for beat '%s' (composed_prompt missing)", beat_id)
         
         full_beats.append(beat)
         current_time += duration
@@ -244,8 +249,8 @@ def build_full_spec(llm_output: dict, video_id: str) -> dict:
         "duration": current_time,
         "fps": 30,
         "resolution": "1280x720",
-        "product": intent['product'],
-        "style": style,
+        "product": dict(intent['product']),
+        "style": dict(style),
         "beats": full_beats,
         # NEW: Add extracted/inferred fields from LLM
         "brand_name": llm_output.get('brand_name'),
@@ -260,8 +265,8 @@ def build_full_spec(llm_output: dict, video_id: str) -> dict:
     }
     
     logger.info(
-        f"✅ Built full spec: {len(full_beats)} beats, "
-        f"{current_time}s duration, archetype={spec['template']}"
+        "✅ Built full spec: %d beats, %ss duration, archetype=%s",
+        len(full_beats), current_time, spec['template']
     )
     
     return spec
@@ -5,14 +5,18 @@ Generates one image per beat using FLUX Dev model (same as Phase 3).
 """
 
 import os
-import tempfile
 import requests
 import logging
-from typing import Dict
-from app.services.replicate import replicate_client
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from app.services.replicate import replicate_client, first_output_url
 from app.services.s3 import s3_client
 from app.services.controlnet import controlnet_service
-from app.common.constants import get_video_s3_key, COST_FLUX_DEV_IMAGE, COST_FLUX_DEV_CONTROLNET_IMAGE
+from app.common.constants import get_video_s3_key, COST_FLUX_DEV_IMAGE, COST_FLUX_DEV_CONTROLNET_IMAGE, PHASE2_MAX_CONCURRENCY
 from app.common.exceptions import PhaseException
 from app.database import SessionLocal
 from app.common.models import Asset
@@ -22,6 +26,128 @@ logger = logging.getLogger(__name__)
 # Debug flag: Exit early after model decision (for debugging ControlNet selection)
 DEBUG_EXIT_AFTER_MODEL_DECISION = False  # Set to True to enable debug mode
 
+# Pooled HTTP session for downloading generated images: keep-alive connections to
+# Replicate's delivery CDN are reused across beats (and across the concurrent beat
+# threads) instead of a new TCP+TLS handshake per download. Transient CDN 5xx
+# responses are retried with backoff rather than failing the whole beat.
+http_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=PHASE2_MAX_CONCURRENCY,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+)
+http_session.mount("https://", _adapter)
+http_session.mount("http://", _adapter)
+
+# Negative prompt for storyboard generation (identical for every beat)
+NEGATIVE_PROMPT = (
+    "blurry, low quality, distorted, deformed, ugly, amateur, "
+    "watermark, text, signature, letters, words, "
+    "multiple subjects, cluttered, busy, messy, chaotic"
+)
+
+
+def index_user_assets(user_assets: list = None) -> Dict:
+    """
+    Index user assets by asset_id (first occurrence wins, matching a linear scan).
+    
+    Build once per video and pass to generate_beat_image so per-beat asset lookups
+    are dict hits instead of scans over the whole asset list.
+    """
+    assets_by_id = {}
+    for asset in user_assets or []:
+        assets_by_id.setdefault(asset.get('asset_id'), asset)
+    return assets_by_id
+
+
+class ControlNetInputCache:
+    """
+    Downloaded product image + canny control image per asset, shared by the beats of one storyboard.
+    
+    Both are pure functions of the asset, so the first beat that needs an asset does the
+    DB lookup, S3 download and canny pass; concurrent beats using the same asset wait for
+    that result instead of repeating it. Call cleanup() once the phase is done with the files.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Future] = {}
+    
+    def get(self, asset_id: str) -> Optional[Tuple[str, str]]:
+        """
+        Return (product_image_path, control_image_path) for asset_id, or None if the
+        asset has no usable image. Preprocessing errors are re-raised to every caller.
+        """
+        with self._lock:
+            entry = self._entries.get(asset_id)
+            is_owner = entry is None
+            if is_owner:
+                entry = self._entries[asset_id] = Future()
+        
+        if is_owner:
+            try:
+                entry.set_result(self._prepare(asset_id))
+            except Exception as e:
+                entry.set_exception(e)
+        return entry.result()
+    
+    @staticmethod
+    def _prepare(asset_id: str) -> Optional[Tuple[str, str]]:
+        with SessionLocal() as db:
+            asset = db.query(Asset).filter(Asset.id == asset_id).first()
+            asset_s3_url = asset.s3_url if asset else None
+        if not asset_s3_url:
+            logger.warning(f"Product asset {asset_id} not found or missing S3 URL, falling back to regular flux-dev")
+            return None
+        
+        # Download product image from S3
+        product_image_path = s3_client.download_temp(asset_s3_url)
+        if not product_image_path or not os.path.exists(product_image_path):
+            logger.warning(f"Failed to download product image from {asset_s3_url}, falling back to regular flux-dev")
+            return None
+        
+        try:
+            # Preprocess for ControlNet (extract edges)
+            control_image_path = controlnet_service.preprocess_for_controlnet(
+                product_image_path,
+                method="canny"
+            )
+        except Exception:
+            os.remove(product_image_path)
+            raise
+        
+        logger.info(f"   Prepared ControlNet inputs for asset {asset_id}")
+        return product_image_path, control_image_path
+    
+    def cleanup(self) -> None:
+        """Remove every downloaded/preprocessed temp file."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        
+        for entry in entries:
+            if entry.done() and entry.exception() is None and entry.result():
+                for path in entry.result():
+                    if os.path.exists(path):
+                        os.remove(path)
+
+
+@lru_cache(maxsize=64)
+def _style_suffix(colors_str: str, lighting: str, aesthetic: str) -> str:
+    """
+    Style part of the storyboard prompt, shared by every beat of a video.
+    
+    Only changes for a beat whose reference assets add colors to the palette.
+    """
+    return ', '.join([
+        f"{colors_str} color palette",
+        f"{lighting} lighting",
+        f"{aesthetic} aesthetic",
+        "cinematic composition",
+        "high quality professional photography",
+        "1280x720 aspect ratio",
+    ])
+
 
 def generate_beat_image(
     video_id: str,
@@ -32,7 +158,9 @@ def generate_beat_image(
     user_id: str,
     reference_mapping: Dict = None,
     user_assets: list = None,
-    spec: Dict = None
+    spec: Dict = None,
+    user_assets_by_id: Dict = None,
+    controlnet_inputs: ControlNetInputCache = None
 ) -> Dict:
     """
     Generate a storyboard image for a single beat.
@@ -50,6 +178,10 @@ def generate_beat_image(
         reference_mapping: Optional dict mapping beat_id to reference assets (from Phase 1)
         user_assets: Optional list of user asset dicts (from Phase 0) for metadata lookup
         spec: Full video specification (used to extract brand_name for closing beats)
+        user_assets_by_id: Optional asset_id -> asset index over user_assets (see
+                           index_user_assets); built here if not provided
+        controlnet_inputs: Optional ControlNetInputCache shared across the video's beats;
+                           if not provided, one is created and cleaned up for this beat
         
     Returns:
         Dictionary with:
@@ -82,6 +214,9 @@ def generate_beat_image(
     # Track which assets are referenced for this beat
     referenced_asset_ids = []
     
+    if user_assets_by_id is None:
+        user_assets_by_id = index_user_assets(user_assets)
+    
     # Check if this beat has reference assets in the mapping
     beat_id = beat.get('beat_id')
     reference_info = None
@@ -103,13 +238,14 @@ def generate_beat_image(
     
     # Enhance prompt with reference asset information
     reference_prompt_parts = []
+    asset_palette = None  # Palette with referenced asset colors merged in (if any)
     if reference_info and user_assets:
         asset_ids = reference_info.get('asset_ids', [])
         usage_type = reference_info.get('usage_type', 'product')
         
-        # Look up asset details from user_assets list
+        # Look up asset details from user_assets
         for asset_id in asset_ids:
-            asset = next((a for a in user_assets if a.get('asset_id') == asset_id), None)
+            asset = user_assets_by_id.get(asset_id)
             if asset:
                 referenced_asset_ids.append(asset_id)
                 
@@ -140,15 +276,19 @@ def generate_beat_image(
                 
                 # Merge asset colors into palette if available
                 if asset_colors:
+                    if asset_palette is None:
+                        asset_palette = list(color_palette)  # Copy - don't mutate the spec's style
                     # Prepend asset colors to existing palette (give them priority)
-                    color_palette = asset_colors[:2] + color_palette  # Take top 2 colors from asset
-                    colors_str = ', '.join(color_palette[:5])  # Limit to 5 total colors
-                    logger.info(f"Enhanced color palette with asset colors: {colors_str}")
+                    asset_palette[:0] = asset_colors[:2]  # Take top 2 colors from asset
                 
                 logger.info(
                     f"Enhanced prompt with {usage_type} reference: {asset_name or primary_object} "
                     f"(asset_id: {asset_id})"
                 )
+        
+        if asset_palette is not None:
+            colors_str = ', '.join(asset_palette[:5])  # Limit to 5 total colors
+            logger.info(f"Enhanced color palette with asset colors: {colors_str}")
     
     # Check if this is a closing beat and handle brand/logo overlay
     is_closing_beat = beat.get('typical_position') == 'closing'
@@ -162,7 +302,7 @@ def generate_beat_image(
         if reference_info and user_assets:
             asset_ids = reference_info.get('asset_ids', [])
             for asset_id in asset_ids:
-                asset = next((a for a in user_assets if a.get('asset_id') == asset_id), None)
+                asset = user_assets_by_id.get(asset_id)
                 if asset and asset.get('reference_asset_type') == 'logo':
                     has_logo_asset = True
                     logger.info(f"✅ Logo asset found in references: {asset.get('name')} (will use ControlNet)")
@@ -185,23 +325,11 @@ def generate_beat_image(
         prompt_parts.extend(reference_prompt_parts)
     
     # Add style information
-    prompt_parts.append(f"{colors_str} color palette")
-    prompt_parts.append(f"{lighting} lighting")
-    prompt_parts.append(f"{aesthetic} aesthetic")
-    prompt_parts.append("cinematic composition")
-    prompt_parts.append("high quality professional photography")
-    prompt_parts.append("1280x720 aspect ratio")
+    prompt_parts.append(_style_suffix(colors_str, lighting, aesthetic))
     prompt_parts.append(f"{shot_type} shot framing")
     
     full_prompt = ', '.join(prompt_parts)
     
-    # Create negative prompt
-    negative_prompt = (
-        "blurry, low quality, distorted, deformed, ugly, amateur, "
-        "watermark, text, signature, letters, words, "
-        "multiple subjects, cluttered, busy, messy, chaotic"
-    )
-    
     logger.info(
         f"Generating storyboard image for beat {beat_index} ({beat.get('beat_id', 'unknown')}): "
         f"{full_prompt[:100]}..."
@@ -235,7 +363,7 @@ def generate_beat_image(
         # Also check all assets to see their actual types (in case usage_type doesn't match)
         if asset_ids:
             for asset_id in asset_ids:
-                asset = next((a for a in user_assets if a.get('asset_id') == asset_id), None)
+                asset = user_assets_by_id.get(asset_id)
                 if asset:
                     asset_type = asset.get('reference_asset_type', '')
                     if asset_type == 'logo':
@@ -266,67 +394,46 @@ def generate_beat_image(
         logger.info(f"   ⚠️ Not using ControlNet - reference_info={reference_info is not None}, user_assets={user_assets is not None}")
     
     try:
-        temp_path = None
+        image_bytes = None
         if use_controlnet and product_asset_id:
-            # ControlNet path: Download product image, preprocess, generate with ControlNet
-            db = SessionLocal()
+            # ControlNet path: product image + canny edges (prepared once per asset), generate with ControlNet
+            owns_controlnet_inputs = controlnet_inputs is None
+            if owns_controlnet_inputs:
+                controlnet_inputs = ControlNetInputCache()
             try:
-                asset = db.query(Asset).filter(Asset.id == product_asset_id).first()
-                if not asset or not asset.s3_url:
-                    logger.warning(f"Product asset {product_asset_id} not found or missing S3 URL, falling back to regular flux-dev")
+                prepared_inputs = controlnet_inputs.get(product_asset_id)
+                if prepared_inputs is None:
                     use_controlnet = False
                 else:
-                    # Download product image from S3
-                    try:
-                        product_image_path = s3_client.download_temp(asset.s3_url)
-                        if not product_image_path or not os.path.exists(product_image_path):
-                            logger.warning(f"Failed to download product image from {asset.s3_url}, falling back to regular flux-dev")
-                            use_controlnet = False
-                        else:
-                            control_image_path = None
-                            try:
-                                # Preprocess for ControlNet (extract edges)
-                                control_image_path = controlnet_service.preprocess_for_controlnet(
-                                    product_image_path,
-                                    method="canny"
-                                )
-                                
-                                # Generate with ControlNet
-                                generated_image_url = controlnet_service.generate_with_controlnet(
-                                    prompt=full_prompt,
-                                    control_image_path=control_image_path,
-                                    control_strength=0.5,  # ControlNet strength for edge structure (default for Canny)
-                                    aspect_ratio="16:9",
-                                    negative_prompt=negative_prompt,
-                                    steps=45,  # Higher steps for better quality
-                                    guidance_scale=5.0,  # Higher guidance for better prompt adherence
-                                    reference_image_path=product_image_path,  # Original product/image asset for image-to-image
-                                    image_to_image_strength=image_to_image_strength  # 0.25 for logo scenes, 0.15 for product-only
-                                )
-                                
-                                # Download generated image
-                                response = requests.get(generated_image_url, timeout=60)
-                                response.raise_for_status()
-                                
-                                # Save to temp file
-                                temp_path = tempfile.mktemp(suffix='.png')
-                                with open(temp_path, 'wb') as f:
-                                    f.write(response.content)
-                                
-                                logger.info(f"   ✅ Generated with ControlNet (cost: ${COST_FLUX_DEV_CONTROLNET_IMAGE:.4f})")
-                            finally:
-                                # Cleanup preprocessing temp files
-                                if product_image_path and os.path.exists(product_image_path):
-                                    os.remove(product_image_path)
-                                if control_image_path and os.path.exists(control_image_path):
-                                    os.remove(control_image_path)
-                    except Exception as e:
-                        logger.warning(f"Error downloading/preprocessing product image: {str(e)}, falling back to regular flux-dev")
-                        use_controlnet = False
+                    product_image_path, control_image_path = prepared_inputs
+                    
+                    # Generate with ControlNet
+                    generated_image_url = controlnet_service.generate_with_controlnet(
+                        prompt=full_prompt,
+                        control_image_path=control_image_path,
+                        control_strength=0.5,  # ControlNet strength for edge structure (default for Canny)
+                        aspect_ratio="16:9",
+                        negative_prompt=NEGATIVE_PROMPT,
+                        steps=45,  # Higher steps for better quality
+                        guidance_scale=5.0,  # Higher guidance for better prompt adherence
+                        reference_image_path=product_image_path,  # Original product/image asset for image-to-image
+                        image_to_image_strength=image_to_image_strength  # 0.25 for logo scenes, 0.15 for product-only
+                    )
+                    
+                    # Download generated image (kept in memory for the S3 upload)
+                    response = http_session.get(generated_image_url, timeout=60)
+                    response.raise_for_status()
+                    image_bytes = response.content
+                    
+                    logger.info(f"   ✅ Generated with ControlNet (cost: ${COST_FLUX_DEV_CONTROLNET_IMAGE:.4f})")
+            except Exception as e:
+                logger.warning(f"Error downloading/preprocessing product image: {str(e)}, falling back to regular flux-dev")
+                use_controlnet = False
             finally:
-                db.close()
+                if owns_controlnet_inputs:
+                    controlnet_inputs.cleanup()
         
-        if not use_controlnet or temp_path is None:
+        if not use_controlnet or image_bytes is None:
             # Regular flux-dev path (no ControlNet)
             logger.info(f"   Using Replicate FLUX Dev model (no ControlNet)...")
             output = replicate_client.run(
@@ -342,21 +449,12 @@ def generate_beat_image(
             )
             
             # Extract image URL from output
-            if isinstance(output, str):
-                generated_image_url = output
-            elif isinstance(output, list) and len(output) > 0:
-                generated_image_url = output[0]
-            else:
-                generated_image_url = list(output)[0] if hasattr(output, '__iter__') else str(output)
+            generated_image_url = first_output_url(output)
             
-            # Download image
-            response = requests.get(generated_image_url, timeout=60)
+            # Download image (kept in memory for the S3 upload)
+            response = http_session.get(generated_image_url, timeout=60)
             response.raise_for_status()
-            
-            # Save to temp file
-            temp_path = tempfile.mktemp(suffix='.png')
-            with open(temp_path, 'wb') as f:
-                f.write(response.content)
+            image_bytes = response.content
             
             logger.info(f"   ✅ Generated with flux-dev (cost: ${COST_FLUX_DEV_IMAGE:.4f})")
         
@@ -365,14 +463,10 @@ def generate_beat_image(
             raise PhaseException("user_id is required for S3 uploads")
         
         s3_key = get_video_s3_key(user_id, video_id, f"beat_{beat_index:02d}.png")
-        s3_url = s3_client.upload_file(temp_path, s3_key)
+        s3_url = s3_client.upload_bytes(image_bytes, s3_key, content_type="image/png")
         
         logger.info(f"✅ Uploaded storyboard image to S3: {s3_url[:80]}...")
         
-        # Cleanup temp file
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-        
         # Return beat image info
         return {
             "beat_id": beat.get('beat_id'),
@@ -387,9 +481,5 @@ def generate_beat_image(
         }
         
     except Exception as e:
-        # Cleanup temp file if it exists
-        if 'temp_path' in locals() and os.path.exists(temp_path):
-            os.remove(temp_path)
-        
         raise PhaseException(f"Failed to generate storyboard image for beat {beat_index}: {str(e)}")
 
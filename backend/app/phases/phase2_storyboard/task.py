@@ -7,15 +7,13 @@ Each image is uploaded to S3 and the URL is saved to the beat in the spec.
 
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from app.orchestrator.celery_app import celery_app
 from app.common.schemas import PhaseOutput
-from app.phases.phase2_storyboard.image_generation import generate_beat_image
-from app.common.constants import COST_FLUX_DEV_IMAGE, COST_FLUX_DEV_CONTROLNET_IMAGE
+from app.phases.phase2_storyboard.image_generation import generate_beat_image, index_user_assets, ControlNetInputCache
+from app.common.constants import COST_FLUX_DEV_IMAGE, COST_FLUX_DEV_CONTROLNET_IMAGE, PHASE2_MAX_CONCURRENCY
 from app.common.exceptions import PhaseException
-from app.orchestrator.progress import update_progress, update_cost
-from app.database import SessionLocal
-from app.common.models import VideoGeneration
-from sqlalchemy.orm.attributes import flag_modified
+from app.orchestrator.progress import update_progress, update_cost, store_phase_output
 
 logger = logging.getLogger(__name__)
 
@@ -75,15 +73,16 @@ def _generate_storyboard_impl(video_id: str, spec: dict, user_id: str = None, re
         total_cost = 0.0
         all_referenced_asset_ids = set()  # Track all assets used across beats
         
-        # Generate one image per beat
-        for beat_index, beat in enumerate(beats):
+        user_assets_by_id = index_user_assets(user_assets)
+        # Beats sharing a product/logo asset reuse one download + canny pass
+        controlnet_inputs = ControlNetInputCache()
+        
+        def generate_one(beat_index: int, beat: dict) -> dict:
             logger.info(
                 f"Generating storyboard image {beat_index + 1}/{len(beats)}: "
                 f"beat_id={beat.get('beat_id')}, duration={beat.get('duration')}s"
             )
-            
-            # Generate image for this beat
-            beat_image_info = generate_beat_image(
+            return generate_beat_image(
                 video_id=video_id,
                 beat_index=beat_index,
                 beat=beat,
@@ -92,9 +91,25 @@ def _generate_storyboard_impl(video_id: str, spec: dict, user_id: str = None, re
                 user_id=user_id,
                 reference_mapping=reference_mapping,
                 user_assets=user_assets,
-                spec=spec
+                spec=spec,
+                user_assets_by_id=user_assets_by_id,
+                controlnet_inputs=controlnet_inputs
             )
-            
+        
+        # Generate one image per beat, concurrently - beats are independent and each one
+        # is mostly waiting on Replicate/S3. map() keeps results in beat order and
+        # re-raises the first failure; beats not yet started are cancelled.
+        executor = ThreadPoolExecutor(
+            max_workers=min(PHASE2_MAX_CONCURRENCY, len(beats)),
+            thread_name_prefix="phase2-beat"
+        )
+        try:
+            beat_image_infos = list(executor.map(generate_one, range(len(beats)), beats))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            controlnet_inputs.cleanup()
+        
+        for beat_index, (beat, beat_image_info) in enumerate(zip(beats, beat_image_infos)):
             # Add image URL to the beat in spec
             beat['image_url'] = beat_image_info['image_url']
             
@@ -157,30 +172,20 @@ def _generate_storyboard_impl(video_id: str, spec: dict, user_id: str = None, re
             logger.info(f"✅ Persisted {len(storyboard_urls)} storyboard URLs to Redis")
         
         # Store Phase 2 output in database
-        db = SessionLocal()
-        try:
-            video = db.query(VideoGeneration).filter(VideoGeneration.id == video_id).first()
-            if video:
-                if video.phase_outputs is None:
-                    video.phase_outputs = {}
-                output_dict = {
-                    "video_id": video_id,
-                    "phase": "phase2_storyboard",
-                    "status": "success",
-                    "output_data": {
-                        "storyboard_images": storyboard_images,
-                        "spec": spec,
-                        "referenced_asset_ids": list(all_referenced_asset_ids)  # Track for usage counting
-                    },
-                    "cost_usd": total_cost,
-                    "duration_seconds": duration_seconds,
-                    "error_message": None
-                }
-                video.phase_outputs['phase2_storyboard'] = output_dict
-                flag_modified(video, 'phase_outputs')
-                db.commit()
-        finally:
-            db.close()
+        output_dict = {
+            "video_id": video_id,
+            "phase": "phase2_storyboard",
+            "status": "success",
+            "output_data": {
+                "storyboard_images": storyboard_images,
+                "spec": spec,
+                "referenced_asset_ids": list(all_referenced_asset_ids)  # Track for usage counting
+            },
+            "cost_usd": total_cost,
+            "duration_seconds": duration_seconds,
+            "error_message": None
+        }
+        store_phase_output(video_id, 'phase2_storyboard', output_dict)
         
         # Create success output
         # Note: spec is updated in-place with image_url added to each beat
@@ -216,26 +221,16 @@ def _generate_storyboard_impl(video_id: str, spec: dict, user_id: str = None, re
         )
         
         # Store failure in database
-        db = SessionLocal()
-        try:
-            video = db.query(VideoGeneration).filter(VideoGeneration.id == video_id).first()
-            if video:
-                if video.phase_outputs is None:
-                    video.phase_outputs = {}
-                output_dict = {
-                    "video_id": video_id,
-                    "phase": "phase2_storyboard",
-                    "status": "failed",
-                    "output_data": {},
-                    "cost_usd": 0.0,
-                    "duration_seconds": duration_seconds,
-                    "error_message": str(e)
-                }
-                video.phase_outputs['phase2_storyboard'] = output_dict
-                flag_modified(video, 'phase_outputs')
-                db.commit()
-        finally:
-            db.close()
+        output_dict = {
+            "video_id": video_id,
+            "phase": "phase2_storyboard",
+            "status": "failed",
+            "output_data": {},
+            "cost_usd": 0.0,
+            "duration_seconds": duration_seconds,
+            "error_message": str(e)
+        }
+        store_phase_output(video_id, 'phase2_storyboard', output_dict)
         
         # Create failure output
         output = PhaseOutput(
@@ -9,7 +9,7 @@ import json
 from datetime import datetime
 from typing import Optional, List, Dict, Tuple
 
-from app.services.replicate import replicate_client
+from app.services.replicate import replicate_client, first_output_url
 from app.services.s3 import s3_client
 from app.phases.phase3_chunks.schemas import ChunkSpec
 from app.phases.phase3_chunks.model_config import get_default_model, get_model_config
@@ -385,13 +385,7 @@ def generate_single_chunk_continuous(chunk_spec_obj: ChunkSpec) -> dict:
             )
         
         # Download generated video
-        if isinstance(output, str):
-            video_url = output
-        elif hasattr(output, '__iter__') and not isinstance(output, (str, bytes)):
-            video_list = list(output)
-            video_url = video_list[0] if video_list else str(output)
-        else:
-            video_url = str(output)
+        video_url = first_output_url(output)
         
         video_path = tempfile.mktemp(suffix='.mp4')
         temp_files.append(video_path)
@@ -565,13 +559,7 @@ def generate_single_chunk_with_storyboard(
                 )
             
             # Download generated video
-            if isinstance(output, str):
-                video_url = output
-            elif hasattr(output, '__iter__') and not isinstance(output, (str, bytes)):
-                video_list = list(output)
-                video_url = video_list[0] if video_list else str(output)
-            else:
-                video_url = str(output)
+            video_url = first_output_url(output)
             
             video_path = tempfile.mktemp(suffix='.mp4')
             temp_files.append(video_path)
@@ -1,6 +1,7 @@
 # Phase 4: Parallel Chunk Generation Service
 import time
 import json
+import logging
 from datetime import datetime
 from typing import List, Dict
 from celery import group
@@ -10,6 +11,8 @@ from app.phases.phase3_chunks.chunk_generator import (
 )
 from app.common.exceptions import PhaseException
 
+logger = logging.getLogger(__name__)
+
 
 class ChunkGenerationService:
     """Service for generating video chunks in parallel"""
@@ -114,26 +117,27 @@ class ChunkGenerationService:
             has_style_guide = bool(reference_urls and reference_urls.get('style_guide_url'))
             has_product_ref = bool(reference_urls and reference_urls.get('product_reference_url'))
             
-            print("="*70)
-            print(f"📋 [{timestamp}] Phase 4 Input Summary")
-            print("="*70)
-            print(f"   Video ID: {video_id}")
-            print(f"   Duration: {spec.get('duration', 0)}s")
-            print(f"   Beats: {num_beats}")
-            print(f"   Animatic URLs: {num_animatic_urls}")
-            print(f"   Style Guide: {'✅' if has_style_guide else '❌'}")
-            print(f"   Product Reference: {'✅' if has_product_ref else '❌'}")
-            print("="*70)
+            logger.info("="*70)
+            logger.info("📋 [%s] Phase 4 Input Summary", timestamp)
+            logger.info("="*70)
+            logger.info("   Video ID: %s", video_id)
+            logger.info("   Duration: %ss", spec.get('duration', 0))
+            logger.info("   Beats: %s", num_beats)
+            logger.info("   Animatic URLs: %s", num_animatic_urls)
+            logger.info("   Style Guide: %s", '✅' if has_style_guide else '❌')
+            logger.info("   Product Reference: %s", '✅' if has_product_ref else '❌')
+            logger.info("="*70)
             
-            # Log full details
-            print(f"📄 [{timestamp}] Full Input Details")
-            print(f"   Spec: {json.dumps(spec, indent=2, default=str)}")
-            print(f"   Animatic URLs: {json.dumps(animatic_urls, indent=2) if animatic_urls else '[]'}")
-            print(f"   Reference URLs: {json.dumps(reference_urls, indent=2) if reference_urls else '{}'}")
-            print("="*70)
+            # Log full details (DEBUG only - the spec carries every beat's multi-KB prompt,
+            # so skip serializing it at all unless someone is reading it)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📄 [%s] Full Input Details", timestamp)
+                logger.debug("   Spec: %s", json.dumps(spec, indent=2, default=str))
+                logger.debug("   Animatic URLs: %s", json.dumps(animatic_urls, indent=2) if animatic_urls else '[]')
+                logger.debug("   Reference URLs: %s", json.dumps(reference_urls, indent=2) if reference_urls else '{}')
             
             # Build chunk specifications using storyboard logic
-            print(f"🔨 Building chunk specifications for {video_id} (Storyboard Mode)...")
+            logger.info("🔨 Building chunk specifications for %s (Storyboard Mode)...", video_id)
             chunk_specs, beat_to_chunk_map = build_chunk_specs_with_storyboard(
                 video_id=video_id,
                 spec=spec,
@@ -143,7 +147,7 @@ class ChunkGenerationService:
             self.beat_to_chunk_map = beat_to_chunk_map  # Store for retry logic
             num_chunks = len(chunk_specs)
             
-            print(f"Generating {num_chunks} chunks in parallel...")
+            logger.info("Generating %s chunks in parallel...", num_chunks)
             
             # Generate chunks sequentially
             # Only chunks within the same beat (beat spans multiple chunks) use last-frame continuation
@@ -155,7 +159,7 @@ class ChunkGenerationService:
             
             for i, chunk_spec in enumerate(chunk_specs):
                 try:
-                    print(f"Generating chunk {i+1}/{num_chunks}...")
+                    logger.info("Generating chunk %s/%s...", i+1, num_chunks)
                     
                     # Update progress: Phase 4 starts at 50%, ends at 70%
                     # Each chunk adds (20% / num_chunks) to progress
@@ -172,16 +176,16 @@ class ChunkGenerationService:
                     if self._should_use_last_frame(i, spec):
                         if i - 1 < len(last_frame_urls) and last_frame_urls[i - 1]:
                             chunk_spec.previous_chunk_last_frame = last_frame_urls[i - 1]
-                            print(f"   🔄 Chunk {i}: Using last-frame continuation (same beat as previous chunk)")
+                            logger.info("   🔄 Chunk %s: Using last-frame continuation (same beat as previous chunk)", i)
                         else:
-                            print(f"   ⚠️  Warning: Chunk {i} should use last-frame but previous chunk's last frame not available")
+                            logger.warning("   ⚠️  Warning: Chunk %s should use last-frame but previous chunk's last frame not available", i)
                     else:
                         # Chunk is independent (starts new beat or beat only needs one chunk)
                         chunk_spec.previous_chunk_last_frame = None
                         if i in self.beat_to_chunk_map:
-                            print(f"   🎨 Chunk {i}: Using storyboard image (starts new beat)")
+                            logger.info("   🎨 Chunk %s: Using storyboard image (starts new beat)", i)
                         else:
-                            print(f"   📸 Chunk {i}: Independent chunk (beat only needs one chunk)")
+                            logger.info("   📸 Chunk %s: Independent chunk (beat only needs one chunk)", i)
                     
                     # Generate chunk directly (function call, not Celery task)
                     # Use storyboard-aware function
@@ -194,7 +198,7 @@ class ChunkGenerationService:
                         # Function raised an exception - add to failed chunks
                         failed_chunks.append((i, chunk_spec))
                         error_type = type(e).__name__
-                        print(f"   ❌ Chunk {i+1} exception ({error_type}): {str(e)}")
+                        logger.warning("   ❌ Chunk %s exception (%s): %s", i+1, error_type, e)
                         continue  # Skip to next chunk
                     
                     if isinstance(chunk_result, dict) and 'chunk_url' in chunk_result:
@@ -208,19 +212,19 @@ class ChunkGenerationService:
                             last_frame_urls.append(None)
                         # Use cost from result (calculated using model config in chunk_generator)
                         self.total_cost += chunk_result.get('cost', 0.0)
-                        print(f"   ✅ Chunk {i+1}/{num_chunks} generated successfully ({len(chunk_urls)}/{num_chunks} complete)")
+                        logger.info("   ✅ Chunk %s/%s generated successfully (%s/%s complete)", i+1, num_chunks, len(chunk_urls), num_chunks)
                     else:
                         failed_chunks.append((i, chunk_spec))
-                        print(f"   ❌ Chunk {i+1} failed: {chunk_result}")
+                        logger.warning("   ❌ Chunk %s failed: %s", i+1, chunk_result)
                 except Exception as e:
                     # Catch any other exceptions (e.g., from apply() itself)
                     failed_chunks.append((i, chunk_spec))
                     error_type = type(e).__name__
-                    print(f"   ❌ Chunk {i+1} exception ({error_type}): {str(e)}")
+                    logger.warning("   ❌ Chunk %s exception (%s): %s", i+1, error_type, e)
             
             # Retry failed chunks (must be in order to maintain last_frame dependencies)
             if failed_chunks:
-                print(f"Retrying {len(failed_chunks)} failed chunks...")
+                logger.info("Retrying %s failed chunks...", len(failed_chunks))
                 # Sort by chunk index to retry in order
                 failed_chunks.sort(key=lambda x: x[0])
                 retry_results = self._retry_failed_chunks(failed_chunks, last_frame_urls, spec)
@@ -244,16 +248,16 @@ class ChunkGenerationService:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
             # ============ SUCCESS LOGGING ============
-            print("="*70)
-            print(f"✅ [{timestamp}] Phase 4 Complete")
-            print("="*70)
-            print(f"   Total Chunks Generated: {len(chunk_urls)}/{num_chunks}")
-            print(f"   Total Cost: ${self.total_cost:.4f}")
-            print(f"   Total Time: {total_time:.1f}s ({total_time/60:.1f} minutes)")
-            print(f"   Chunk URLs:")
+            logger.info("="*70)
+            logger.info("✅ [%s] Phase 4 Complete", timestamp)
+            logger.info("="*70)
+            logger.info("   Total Chunks Generated: %s/%s", len(chunk_urls), num_chunks)
+            logger.info("   Total Cost: $%.4f", self.total_cost)
+            logger.info("   Total Time: %.1fs (%.1f minutes)", total_time, total_time/60)
+            logger.info("   Chunk URLs:")
             for i, url in enumerate(chunk_urls):
-                print(f"      [{i+1}] {url[:80]}...")
-            print("="*70)
+                logger.info("      [%s] %s...", i+1, url[:80])
+            logger.info("="*70)
             
             return {
                 'chunk_urls': chunk_urls,
@@ -287,7 +291,7 @@ class ChunkGenerationService:
             
             while retry_count < max_retries and not success:
                 retry_count += 1
-                print(f"🔄 Retrying chunk {chunk_index} (attempt {retry_count}/{max_retries})...")
+                logger.info("🔄 Retrying chunk %s (attempt %s/%s)...", chunk_index, retry_count, max_retries)
                 
                 try:
                     # Update previous_chunk_last_frame only if this chunk is part of a beat that spans multiple chunks
@@ -305,16 +309,16 @@ class ChunkGenerationService:
                         
                         if prev_frame_url:
                             chunk_spec.previous_chunk_last_frame = prev_frame_url
-                            print(f"   🔄 Using previous chunk's last frame (same beat): {prev_frame_url[:60]}...")
+                            logger.info("   🔄 Using previous chunk's last frame (same beat): %s...", prev_frame_url[:60])
                         else:
-                            print(f"   ⚠️  Warning: Chunk {chunk_index} requires previous chunk's last frame, but it's not available")
+                            logger.warning("   ⚠️  Warning: Chunk %s requires previous chunk's last frame, but it's not available", chunk_index)
                     else:
                         # Chunk is independent, don't use last-frame
                         chunk_spec.previous_chunk_last_frame = None
                         if chunk_index in self.beat_to_chunk_map:
-                            print(f"   🎨 Chunk {chunk_index}: Using storyboard image (starts new beat)")
+                            logger.info("   🎨 Chunk %s: Using storyboard image (starts new beat)", chunk_index)
                         else:
-                            print(f"   📸 Chunk {chunk_index}: Independent chunk (beat only needs one chunk)")
+                            logger.info("   📸 Chunk %s: Independent chunk (beat only needs one chunk)", chunk_index)
                     
                     # Generate chunk directly (function call, not Celery task)
                     # Use storyboard-aware function
@@ -327,14 +331,14 @@ class ChunkGenerationService:
                         # Function raised an exception - capture it
                         error_msg = str(e)
                         error_type = type(e).__name__
-                        print(f"Chunk {chunk_index} retry {retry_count} exception ({error_type}): {error_msg}")
+                        logger.warning("Chunk %s retry %s exception (%s): %s", chunk_index, retry_count, error_type, error_msg)
                         last_error = error_msg
                         continue  # Skip to next retry attempt
                     
                     if isinstance(chunk_result, dict) and 'chunk_url' in chunk_result:
                         retry_results.append((chunk_index, chunk_result))
                         success = True
-                        print(f"   ✅ Chunk {chunk_index} retry {retry_count} succeeded!")
+                        logger.info("   ✅ Chunk %s retry %s succeeded!", chunk_index, retry_count)
                         # Only store last_frame_url if it will be used by next chunk
                         # (i.e., if next chunk is part of same beat)
                         # We need to determine the total number of chunks to check if there's a next chunk
@@ -368,30 +372,25 @@ class ChunkGenerationService:
                     else:
                         # Task completed but returned invalid result
                         error_msg = chunk_result.get('error', str(chunk_result)) if isinstance(chunk_result, dict) else str(chunk_result)
-                        print(f"   ❌ Chunk {chunk_index} retry {retry_count} failed: {error_msg}")
+                        logger.warning("   ❌ Chunk %s retry %s failed: %s", chunk_index, retry_count, error_msg)
                         last_error = error_msg
                 except Exception as e:
                     # Catch any other exceptions (e.g., from apply() itself)
-                    import traceback
-                    error_details = traceback.format_exc()
                     error_msg = str(e)
-                    error_type = type(e).__name__
-                    print(f"   ❌ Chunk {chunk_index} retry {retry_count} exception:")
-                    print(f"      Error type: {error_type}")
-                    print(f"      Error message: {error_msg}")
-                    print(f"      Full traceback:")
-                    for line in error_details.split('\n')[-10:]:  # Last 10 lines
-                        if line.strip():
-                            print(f"         {line}")
+                    # Traceback is formatted once, inside the logging handler
+                    logger.exception(
+                        "   ❌ Chunk %s retry %s exception (%s): %s",
+                        chunk_index, retry_count, type(e).__name__, error_msg
+                    )
                     last_error = error_msg
                 
                 if not success and retry_count < max_retries:
-                    print(f"   ⏳ Waiting 2 seconds before next retry...")
+                    logger.info("   ⏳ Waiting 2 seconds before next retry...")
                     time.sleep(2)  # Brief delay before retry
             
             if not success:
                 error_detail = last_error if last_error else 'Unknown error'
-                print(f"   ❌ Chunk {chunk_index} failed after {max_retries} retries - giving up")
+                logger.error("   ❌ Chunk %s failed after %s retries - giving up", chunk_index, max_retries)
                 retry_results.append((chunk_index, {'error': f'Failed after {max_retries} retries: {error_detail}'}))
         
         return retry_results
\ No newline at end of file
@@ -3,12 +3,11 @@ import time
 import os
 import tempfile
 import logging
-from datetime import datetime
 from app.orchestrator.celery_app import celery_app
 from app.common.schemas import PhaseOutput
 from app.phases.phase3_chunks.stitcher import VideoStitcher
 from app.common.exceptions import PhaseException
-from app.orchestrator.progress import update_progress, update_cost
+from app.orchestrator.progress import update_progress, update_cost, store_phase_output
 from app.database import SessionLocal
 from app.common.models import VideoGeneration
 from sqlalchemy.orm.attributes import flag_modified
@@ -48,8 +47,7 @@ def generate_chunk_reference_image(chunk_spec: ChunkSpec, beat_to_chunk_map: dic
     
     try:
         start_time = time.time()
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]  # Include milliseconds
-        print(f"🚀 [{timestamp}] [PARALLEL Phase 1] Starting reference image chunk {chunk_num} (starts beat)")
+        logger.info("🚀 [PARALLEL Phase 1] Starting reference image chunk %s (starts beat)", chunk_num)
         
         # Call existing function directly (not a Celery task)
         # Convert ChunkSpec to dict for the function
@@ -62,8 +60,7 @@ def generate_chunk_reference_image(chunk_spec: ChunkSpec, beat_to_chunk_map: dic
         )
         
         elapsed = time.time() - start_time
-        timestamp_end = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        print(f"✅ [{timestamp_end}] [PARALLEL Phase 1] Completed reference image chunk {chunk_num} in {elapsed:.1f}s")
+        logger.info("✅ [PARALLEL Phase 1] Completed reference image chunk %s in %.1fs", chunk_num, elapsed)
         
         # Extract and return structured result
         return {
@@ -74,8 +71,7 @@ def generate_chunk_reference_image(chunk_spec: ChunkSpec, beat_to_chunk_map: dic
         }
         
     except Exception as e:
-        timestamp_error = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        print(f"❌ [{timestamp_error}] [PARALLEL Phase 1] Failed reference image chunk {chunk_num}: {str(e)}")
+        logger.error("❌ [PARALLEL Phase 1] Failed reference image chunk %s: %s", chunk_num, e)
         raise PhaseException(f"Failed to generate reference image chunk {chunk_num}: {str(e)}")
 
 
@@ -102,9 +98,8 @@ def generate_chunk_continuous(chunk_spec: ChunkSpec, ref_result: dict) -> dict:
     
     try:
         start_time = time.time()
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]  # Include milliseconds
         ref_chunk_num = ref_result.get('chunk_num', 'unknown')
-        print(f"🚀 [{timestamp}] [PARALLEL Phase 2] Starting continuous chunk {chunk_num} (uses last frame from chunk {ref_chunk_num})")
+        logger.info("🚀 [PARALLEL Phase 2] Starting continuous chunk %s (uses last frame from chunk %s)", chunk_num, ref_chunk_num)
         
         # Extract last_frame_url from reference chunk result
         last_frame_url = ref_result.get('last_frame_url')
@@ -118,8 +113,7 @@ def generate_chunk_continuous(chunk_spec: ChunkSpec, ref_result: dict) -> dict:
         result = generate_single_chunk_continuous(chunk_spec)
         
         elapsed = time.time() - start_time
-        timestamp_end = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        print(f"✅ [{timestamp_end}] [PARALLEL Phase 2] Completed continuous chunk {chunk_num} in {elapsed:.1f}s")
+        logger.info("✅ [PARALLEL Phase 2] Completed continuous chunk %s in %.1fs", chunk_num, elapsed)
         
         # Return structured result (no last_frame_url needed for continuous chunks)
         return {
@@ -129,8 +123,7 @@ def generate_chunk_continuous(chunk_spec: ChunkSpec, ref_result: dict) -> dict:
         }
         
     except Exception as e:
-        timestamp_error = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        print(f"❌ [{timestamp_error}] [PARALLEL Phase 2] Failed continuous chunk {chunk_num}: {str(e)}")
+        logger.error("❌ [PARALLEL Phase 2] Failed continuous chunk %s: %s", chunk_num, e)
         raise PhaseException(f"Failed to generate continuous chunk {chunk_num}: {str(e)}")
 
 
@@ -159,8 +152,8 @@ def generate_chunks_parallel(video_id: str, spec: dict, reference_urls: dict, us
             video_id, spec, reference_urls, user_id
         )
         
-        print(f"   📊 Parallel chunk generation: {len(chunk_specs)} chunks total")
-        print(f"   🗺️  Beat-to-chunk mapping: {beat_to_chunk_map}")
+        logger.info("   📊 Parallel chunk generation: %s chunks total", len(chunk_specs))
+        logger.info("   🗺️  Beat-to-chunk mapping: %s", beat_to_chunk_map)
         
         # Separate reference and continuous chunks
         ref_chunks = []  # List of (chunk_spec, chunk_num) tuples
@@ -187,15 +180,14 @@ def generate_chunks_parallel(video_id: str, spec: dict, reference_urls: dict, us
                 
                 cont_chunks.append((chunk_spec, ref_chunk_num))
         
-        print(f"   📋 Chunk separation: {len(ref_chunks)} reference chunks, {len(cont_chunks)} continuous chunks")
+        logger.info("   📋 Chunk separation: %s reference chunks, %s continuous chunks", len(ref_chunks), len(cont_chunks))
         
         # Phase 1: Generate all reference image chunks in parallel
         ref_results_by_num = {}
         if ref_chunks:
-            phase1_start = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
             ref_chunk_nums = [cn for _, cn in ref_chunks]
-            print(f"   🚀 [{phase1_start}] Phase 1 START: Generating {len(ref_chunks)} reference image chunks in parallel")
-            print(f"      Chunks starting together: {ref_chunk_nums}")
+            logger.info("   🚀 Phase 1 START: Generating %s reference image chunks in parallel", len(ref_chunks))
+            logger.info("      Chunks starting together: %s", ref_chunk_nums)
             
             # Build RunnableParallel dict with proper closure capture
             ref_parallel_dict = {}
@@ -216,20 +208,18 @@ def generate_chunks_parallel(video_id: str, spec: dict, reference_urls: dict, us
                 chunk_num = int(key.split('_')[1])
                 ref_results_by_num[chunk_num] = result
             
-            phase1_end = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-            print(f"   ✅ [{phase1_end}] Phase 1 COMPLETE: {len(ref_results_by_num)} reference chunks generated")
+            logger.info("   ✅ Phase 1 COMPLETE: %s reference chunks generated", len(ref_results_by_num))
             # Update progress: 60% after Phase 1 completes
             update_progress(video_id, "generating_chunks", 60, current_phase="phase3_chunks")
         else:
-            print(f"   ⚠️  Phase 1 skipped: No reference chunks")
+            logger.warning("   ⚠️  Phase 1 skipped: No reference chunks")
         
         # Phase 2: Generate all continuous chunks in parallel
         cont_results_by_num = {}
         if cont_chunks:
-            phase2_start = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
             cont_chunk_nums = [cs.chunk_num for cs, _ in cont_chunks]
-            print(f"   🚀 [{phase2_start}] Phase 2 START: Generating {len(cont_chunks)} continuous chunks in parallel")
-            print(f"      Chunks starting together: {cont_chunk_nums}")
+            logger.info("   🚀 Phase 2 START: Generating %s continuous chunks in parallel", len(cont_chunks))
+            logger.info("      Chunks starting together: %s", cont_chunk_nums)
             
             # Build RunnableParallel dict with proper closure capture
             cont_parallel_dict = {}
@@ -253,10 +243,9 @@ def generate_chunks_parallel(video_id: str, spec: dict, reference_urls: dict, us
                 chunk_num = int(key.split('_')[1])
                 cont_results_by_num[chunk_num] = result
             
-            phase2_end = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-            print(f"   ✅ [{phase2_end}] Phase 2 COMPLETE: {len(cont_results_by_num)} continuous chunks generated")
+            logger.info("   ✅ Phase 2 COMPLETE: %s continuous chunks generated", len(cont_results_by_num))
         else:
-            print(f"   ⚠️  Phase 2 skipped: No continuous chunks")
+            logger.warning("   ⚠️  Phase 2 skipped: No continuous chunks")
         
         # Update progress: 70% after both phases complete
         update_progress(video_id, "generating_chunks", 70, current_phase="phase3_chunks")
@@ -284,7 +273,7 @@ def generate_chunks_parallel(video_id: str, spec: dict, reference_urls: dict, us
         chunk_urls = [chunk['chunk_url'] for chunk in all_chunks]
         total_cost = sum(chunk['cost'] for chunk in all_chunks)
         
-        print(f"   ✅ Parallel generation complete: {len(chunk_urls)} chunks, ${total_cost:.4f} total cost")
+        logger.info("   ✅ Parallel generation complete: %s chunks, $%.4f total cost", len(chunk_urls), total_cost)
         
         return {
             'chunk_urls': chunk_urls,
@@ -364,7 +353,7 @@ def generate_chunks(
         stitcher = VideoStitcher()
         
         # Generate all chunks in parallel using LangChain RunnableParallel
-        print(f"🚀 Phase 3 (Chunks - Storyboard Mode, Parallel) starting for video {video_id}")
+        logger.info("🚀 Phase 3 (Chunks - Storyboard Mode, Parallel) starting for video %s", video_id)
         chunk_results = generate_chunks_parallel(
             video_id=video_id,
             spec=spec,
@@ -381,7 +370,7 @@ def generate_chunks(
         if chunk_urls and len(chunk_urls) > 0:
             try:
                 first_chunk_url = chunk_urls[0]
-                logger.info(f"Generating thumbnail from first chunk: {first_chunk_url}")
+                logger.info("Generating thumbnail from first chunk: %s", first_chunk_url)
                 
                 # Download first chunk from S3
                 first_chunk_path = None
@@ -417,9 +406,9 @@ def generate_chunks(
                                 video.thumbnail_url = thumbnail_url
                                 flag_modified(video, 'thumbnail_url')
                                 db.commit()
-                                logger.info(f"Updated video {video_id} with thumbnail_url: {thumbnail_url}")
+                                logger.info("Updated video %s with thumbnail_url: %s", video_id, thumbnail_url)
                         except Exception as db_error:
-                            logger.warning(f"Failed to update database with thumbnail_url: {str(db_error)}")
+                            logger.warning("Failed to update database with thumbnail_url: %s", db_error)
                             db.rollback()
                         finally:
                             db.close()
@@ -431,19 +420,19 @@ def generate_chunks(
                             except Exception:
                                 pass
                     else:
-                        logger.warning(f"First chunk file not found at {first_chunk_path}")
+                        logger.warning("First chunk file not found at %s", first_chunk_path)
                         
                 except Exception as download_error:
-                    logger.warning(f"Failed to download first chunk for thumbnail: {str(download_error)}")
+                    logger.warning("Failed to download first chunk for thumbnail: %s", download_error)
                     
             except Exception as thumbnail_error:
                 # Don't fail Phase 3 if thumbnail generation fails
-                logger.warning(f"Thumbnail generation failed (non-blocking): {str(thumbnail_error)}", exc_info=True)
+                logger.warning("Thumbnail generation failed (non-blocking): %s", thumbnail_error, exc_info=True)
         
         # Now proceed to stitching
         
         # Stitch chunks together with transitions
-        print(f"Stitching {len(chunk_urls)} chunks with transitions...")
+        logger.info("Stitching %s chunks with transitions...", len(chunk_urls))
         transitions = spec.get('transitions', [])
         stitched_video_url = stitcher.stitch_with_transitions(
             video_id=video_id,
@@ -479,6 +468,8 @@ def generate_chunks(
             duration_seconds=duration_seconds,
             error_message=None
         )
+        # Serialize once - the same dict is stored in phase_outputs and returned
+        output_dict = output.model_dump()
         
         # Update cost tracking
         update_cost(video_id, "phase3", total_cost)
@@ -492,29 +483,25 @@ def generate_chunks(
             total_cost=total_cost
         )
         
-        # Store Phase 3 output in database
-        db = SessionLocal()
-        try:
-            video = db.query(VideoGeneration).filter(VideoGeneration.id == video_id).first()
-            if video:
-                if video.phase_outputs is None:
-                    video.phase_outputs = {}
-                video.phase_outputs['phase3_chunks'] = output.dict()
-                video.stitched_url = stitched_video_url
-                video.chunk_urls = chunk_urls
-                video.final_video_url = stitched_video_url
-                flag_modified(video, 'phase_outputs')
-                db.commit()
-        finally:
-            db.close()
-        
-        print(f"✅ Phase 3 (Chunks) completed successfully for video {video_id}")
-        print(f"   - Generated chunks: {len(chunk_urls)}")
-        print(f"   - Stitched video: {stitched_video_url}")
-        print(f"   - Total cost: ${total_cost:.4f}")
-        print(f"   - Duration: {duration_seconds:.2f}s")
+        # Store Phase 3 output in database (one UPDATE with the video URL columns)
+        store_phase_output(
+            video_id,
+            'phase3_chunks',
+            output_dict,
+            columns={
+                'stitched_url': stitched_video_url,
+                'chunk_urls': chunk_urls,
+                'final_video_url': stitched_video_url
+            }
+        )
         
-        return output.dict()
+        logger.info("✅ Phase 3 (Chunks) completed successfully for video %s", video_id)
+        logger.info("   - Generated chunks: %s", len(chunk_urls))
+        logger.info("   - Stitched video: %s", stitched_video_url)
+        logger.info("   - Total cost: $%.4f", total_cost)
+        logger.info("   - Duration: %.2fs", duration_seconds)
+        
+        return output_dict
         
     except PhaseException as e:
         # Phase-specific exception
@@ -530,26 +517,16 @@ def generate_chunks(
         )
         
         # Store failure in database
-        db = SessionLocal()
-        try:
-            video = db.query(VideoGeneration).filter(VideoGeneration.id == video_id).first()
-            if video:
-                if video.phase_outputs is None:
-                    video.phase_outputs = {}
-                output_dict = {
-                    "video_id": video_id,
-                    "phase": "phase3_chunks",
-                    "status": "failed",
-                    "output_data": {},
-                    "cost_usd": 0.0,
-                    "duration_seconds": duration_seconds,
-                    "error_message": str(e)
-                }
-                video.phase_outputs['phase3_chunks'] = output_dict
-                flag_modified(video, 'phase_outputs')
-                db.commit()
-        finally:
-            db.close()
+        output_dict = {
+            "video_id": video_id,
+            "phase": "phase3_chunks",
+            "status": "failed",
+            "output_data": {},
+            "cost_usd": 0.0,
+            "duration_seconds": duration_seconds,
+            "error_message": str(e)
+        }
+        store_phase_output(video_id, 'phase3_chunks', output_dict)
         
         output = PhaseOutput(
             video_id=video_id,
@@ -561,7 +538,7 @@ def generate_chunks(
             error_message=str(e)
         )
         
-        print(f"❌ Phase 3 (Chunks) failed for video {video_id}: {str(e)}")
+        logger.error("❌ Phase 3 (Chunks) failed for video %s: %s", video_id, e)
         return output.dict()
         
     except Exception as e:
@@ -578,26 +555,16 @@ def generate_chunks(
         )
         
         # Store failure in database
-        db = SessionLocal()
-        try:
-            video = db.query(VideoGeneration).filter(VideoGeneration.id == video_id).first()
-            if video:
-                if video.phase_outputs is None:
-                    video.phase_outputs = {}
-                output_dict = {
-                    "video_id": video_id,
-                    "phase": "phase3_chunks",
-                    "status": "failed",
-                    "output_data": {},
-                    "cost_usd": 0.0,
-                    "duration_seconds": duration_seconds,
-                    "error_message": f"An unexpected error occurred: {str(e)}"
-                }
-                video.phase_outputs['phase3_chunks'] = output_dict
-                flag_modified(video, 'phase_outputs')
-                db.commit()
-        finally:
-            db.close()
+        output_dict = {
+            "video_id": video_id,
+            "phase": "phase3_chunks",
+            "status": "failed",
+            "output_data": {},
+            "cost_usd": 0.0,
+            "duration_seconds": duration_seconds,
+            "error_message": f"An unexpected error occurred: {str(e)}"
+        }
+        store_phase_output(video_id, 'phase3_chunks', output_dict)
         
         output = PhaseOutput(
             video_id=video_id,
@@ -609,5 +576,5 @@ def generate_chunks(
             error_message=f"An unexpected error occurred: {str(e)}"
         )
         
-        print(f"❌ Phase 3 (Chunks) unexpected error for video {video_id}: {str(e)}")
+        logger.error("❌ Phase 3 (Chunks) unexpected error for video %s: %s", video_id, e)
         return output.dict()
\ No newline at end of file
@@ -1,5 +1,6 @@
 # Phase 5: Music Generation & Audio Integration Service
 import os
+import logging
 import tempfile
 import requests
 import base64
@@ -20,6 +21,27 @@ try:
 except ImportError:
     MUTAGEN_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
+# Template values -> MusicGen-friendly prompt fragments (built once, shared by every prompt)
+MUSIC_STYLE_PROMPTS = {
+    "orchestral": "orchestral music with strings and brass",
+    "upbeat_pop": "upbeat electronic pop music with energetic synthesizers and driving drums",
+    "cinematic_epic": "cinematic epic orchestral music with powerful brass and dramatic percussion",
+}
+
+MUSIC_TEMPO_PROMPTS = {
+    "moderate": "moderate tempo",
+    "fast": "fast tempo with high energy",
+    "slow": "slow tempo, calm and steady",
+}
+
+MUSIC_MOOD_PROMPTS = {
+    "sophisticated": "elegant and sophisticated mood",
+    "energetic": "energetic and dynamic, uplifting mood",
+    "inspiring": "inspiring and uplifting, powerful mood",
+}
+
 
 class RefinementService:
     """Service for music generation and audio integration (Phase 5 - simplified scope).
@@ -98,9 +120,7 @@ class RefinementService:
                     else:
                         print(f"   ⚠️  Video analysis failed, using spec-based audio prompt")
                 except Exception as e:
-                    print(f"   ⚠️  Video analysis error: {str(e)}, using spec-based audio prompt")
-                    import traceback
-                    traceback.print_exc()
+                    logger.warning(f"   ⚠️  Video analysis error: {str(e)}, using spec-based audio prompt", exc_info=True)
                 
                 # Step 3: Get music from library (skip AI generation)
                 print("🎵 Getting music from library...")
@@ -124,9 +144,7 @@ class RefinementService:
                     else:
                         print(f"   ⚠️  No music found in library, video will have no audio")
                 except Exception as e:
-                    print(f"   ⚠️  Music library access failed: {str(e)}, continuing without music")
-                    import traceback
-                    traceback.print_exc()
+                    logger.warning(f"   ⚠️  Music library access failed: {str(e)}, continuing without music", exc_info=True)
                 
                 # Step 4: Combine video + music
                 final_path = stitched_path  # Default to stitched video
@@ -438,15 +456,11 @@ class RefinementService:
                 return cropped_music_path
                 
             except Exception as e:
-                print(f"   ⚠️  Error accessing S3 music library: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.warning(f"   ⚠️  Error accessing S3 music library: {str(e)}", exc_info=True)
                 return None
                 
         except Exception as e:
-            print(f"   ⚠️  Music library error: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.warning(f"   ⚠️  Music library error: {str(e)}", exc_info=True)
             return None
     
     def _read_genre_from_file(self, file_path: str) -> Optional[str]:
@@ -612,27 +626,9 @@ class RefinementService:
             Formatted prompt string for music generation
         """
         # Map template values to MusicGen-friendly prompts
-        style_map = {
-            "orchestral": "orchestral music with strings and brass",
-            "upbeat_pop": "upbeat electronic pop music with energetic synthesizers and driving drums",
-            "cinematic_epic": "cinematic epic orchestral music with powerful brass and dramatic percussion",
-        }
-        
-        tempo_map = {
-            "moderate": "moderate tempo",
-            "fast": "fast tempo with high energy",
-            "slow": "slow tempo, calm and steady",
-        }
-        
-        mood_map = {
-            "sophisticated": "elegant and sophisticated mood",
-            "energetic": "energetic and dynamic, uplifting mood",
-            "inspiring": "inspiring and uplifting, powerful mood",
-        }
-        
-        style_desc = style_map.get(music_style, f"{music_style} instrumental music")
-        tempo_desc = tempo_map.get(tempo, f"{tempo} tempo")
-        mood_desc = mood_map.get(mood, f"{mood} mood")
+        style_desc = MUSIC_STYLE_PROMPTS.get(music_style, f"{music_style} instrumental music")
+        tempo_desc = MUSIC_TEMPO_PROMPTS.get(tempo, f"{tempo} tempo")
+        mood_desc = MUSIC_MOOD_PROMPTS.get(mood, f"{mood} mood")
         
         # Build prompt for MusicGen
         # Example: "upbeat electronic pop music with energetic synthesizers and driving drums, fast tempo with high energy, energetic and dynamic uplifting mood"
@@ -704,9 +700,7 @@ class RefinementService:
             }
             
         except Exception as e:
-            print(f"   ⚠️  Video analysis error: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.warning(f"   ⚠️  Video analysis error: {str(e)}", exc_info=True)
             return None
     
     def _extract_video_frames(self, video_path: str, num_frames: int = 3) -> List[str]:
@@ -844,9 +838,7 @@ Provide a detailed analysis of what music would best match this video content.""
             return analysis
             
         except Exception as e:
-            print(f"   ⚠️  GPT-4V analysis error: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.warning(f"   ⚠️  GPT-4V analysis error: {str(e)}", exc_info=True)
             return None
     
     def _build_audio_prompt_from_analysis(self, analysis: Dict) -> Optional[str]:
@@ -869,12 +861,7 @@ Provide a detailed analysis of what music would best match this video content.""
                 
                 # Build prompt combining description with structured elements
                 # Format: "detailed description, tempo, mood"
-                tempo_map = {
-                    "slow": "slow tempo, calm and steady",
-                    "moderate": "moderate tempo",
-                    "fast": "fast tempo with high energy"
-                }
-                tempo_desc = tempo_map.get(tempo, f"{tempo} tempo")
+                tempo_desc = MUSIC_TEMPO_PROMPTS.get(tempo, f"{tempo} tempo")
                 
                 # Create prompt: use audio_description as base, add tempo
                 prompt = f"{audio_desc}, {tempo_desc}"
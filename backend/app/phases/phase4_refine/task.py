@@ -6,7 +6,7 @@ from app.orchestrator.celery_app import celery_app
 from app.common.schemas import PhaseOutput
 from app.phases.phase4_refine.service import RefinementService
 from app.common.exceptions import PhaseException
-from app.orchestrator.progress import update_progress, update_cost
+from app.orchestrator.progress import update_progress, update_cost, store_phase_output
 from app.database import SessionLocal
 from app.common.models import VideoGeneration, VideoStatus
 from sqlalchemy.orm.attributes import flag_modified
@@ -100,7 +100,7 @@ def refine_video(self, phase3_output: dict, user_id: str = None) -> dict:
         # Update progress at start
         update_progress(video_id, "refining", 90, current_phase="phase4_refine")
         
-        print(f"🎬 Phase 4 (Refinement) starting for video {video_id}...")
+        logger.info("🎬 Phase 4 (Refinement) starting for video %s...", video_id)
         
         service = RefinementService()
         refined_url, music_url = service.refine_all(video_id, stitched_video_url, spec, user_id)
@@ -161,11 +161,11 @@ def refine_video(self, phase3_output: dict, user_id: str = None) -> dict:
                 
                 # Track asset usage now that video is complete
                 try:
-                    logger.info(f"Tracking asset usage for video {video_id}")
+                    logger.info("Tracking asset usage for video %s", video_id)
                     asset_usage_tracker.increment_usage_for_video(video_id, db=db)
                 except Exception as e:
                     # Don't fail the video generation if usage tracking fails
-                    logger.error(f"Failed to track asset usage for video {video_id}: {str(e)}", exc_info=True)
+                    logger.error("Failed to track asset usage for video %s: %s", video_id, e, exc_info=True)
         finally:
             db.close()
         
@@ -192,10 +192,10 @@ def refine_video(self, phase3_output: dict, user_id: str = None) -> dict:
             duration_seconds=duration_seconds
         )
         
-        print(f"✅ Phase 4 (Refinement) completed successfully for video {video_id}")
-        print(f"   - Duration: {duration_seconds:.2f}s")
-        print(f"   - Cost: ${service.total_cost:.4f}")
-        print(f"   - Total cost: ${total_cost:.4f}")
+        logger.info("✅ Phase 4 (Refinement) completed successfully for video %s", video_id)
+        logger.info("   - Duration: %.2fs", duration_seconds)
+        logger.info("   - Cost: $%.4f", service.total_cost)
+        logger.info("   - Total cost: $%.4f", total_cost)
         
         return output.dict()
         
@@ -212,26 +212,16 @@ def refine_video(self, phase3_output: dict, user_id: str = None) -> dict:
         )
         
         # Store failure in database
-        db = SessionLocal()
-        try:
-            video = db.query(VideoGeneration).filter(VideoGeneration.id == video_id).first()
-            if video:
-                if video.phase_outputs is None:
-                    video.phase_outputs = {}
-                output_dict = {
-                    "video_id": video_id,
-                    "phase": "phase4_refine",
-                    "status": "failed",
-                    "output_data": {},
-                    "cost_usd": 0.0,
-                    "duration_seconds": duration_seconds,
-                    "error_message": str(e)
-                }
-                video.phase_outputs['phase4_refine'] = output_dict
-                flag_modified(video, 'phase_outputs')
-                db.commit()
-        finally:
-            db.close()
+        output_dict = {
+            "video_id": video_id,
+            "phase": "phase4_refine",
+            "status": "failed",
+            "output_data": {},
+            "cost_usd": 0.0,
+            "duration_seconds": duration_seconds,
+            "error_message": str(e)
+        }
+        store_phase_output(video_id, 'phase4_refine', output_dict)
         
         output = PhaseOutput(
             video_id=video_id,
@@ -243,7 +233,7 @@ def refine_video(self, phase3_output: dict, user_id: str = None) -> dict:
             error_message=str(e)
         )
         
-        print(f"❌ Phase 4 (Refinement) failed for video {video_id}: {str(e)}")
+        logger.error("❌ Phase 4 (Refinement) failed for video %s: %s", video_id, e)
         return output.dict()
         
     except Exception as e:
@@ -259,26 +249,16 @@ def refine_video(self, phase3_output: dict, user_id: str = None) -> dict:
         )
         
         # Store failure in database
-        db = SessionLocal()
-        try:
-            video = db.query(VideoGeneration).filter(VideoGeneration.id == video_id).first()
-            if video:
-                if video.phase_outputs is None:
-                    video.phase_outputs = {}
-                output_dict = {
-                    "video_id": video_id,
-                    "phase": "phase4_refine",
-                    "status": "failed",
-                    "output_data": {},
-                    "cost_usd": 0.0,
-                    "duration_seconds": duration_seconds,
-                    "error_message": f"An unexpected error occurred: {str(e)}"
-                }
-                video.phase_outputs['phase4_refine'] = output_dict
-                flag_modified(video, 'phase_outputs')
-                db.commit()
-        finally:
-            db.close()
+        output_dict = {
+            "video_id": video_id,
+            "phase": "phase4_refine",
+            "status": "failed",
+            "output_data": {},
+            "cost_usd": 0.0,
+            "duration_seconds": duration_seconds,
+            "error_message": f"An unexpected error occurred: {str(e)}"
+        }
+        store_phase_output(video_id, 'phase4_refine', output_dict)
         
         output = PhaseOutput(
             video_id=video_id,
@@ -290,5 +270,5 @@ def refine_video(self, phase3_output: dict, user_id: str = None) -> dict:
             error_message=f"An unexpected error occurred: {str(e)}"
         )
         
-        print(f"❌ Phase 4 (Refinement) unexpected error for video {video_id}: {str(e)}")
+        logger.error("❌ Phase 4 (Refinement) unexpected error for video %s: %s", video_id, e)
         return output.dict()
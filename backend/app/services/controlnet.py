@@ -90,7 +90,7 @@ class ControlNetService:
         Returns:
             URL of generated image
         """
-        from app.services.replicate import replicate_client
+        from app.services.replicate import replicate_client, first_output_url
         
         try:
             logger.info(f"Generating image with flux-dev-controlnet: {prompt[:80]}...")
@@ -139,12 +139,7 @@ class ControlNetService:
                     ref_file.close()
             
             # Extract image URL from output
-            if isinstance(output, str):
-                image_url = output
-            elif isinstance(output, list) and len(output) > 0:
-                image_url = output[0]
-            else:
-                image_url = list(output)[0] if hasattr(output, '__iter__') else str(output)
+            image_url = first_output_url(output)
             
             logger.info(f"✅ Generated image with ControlNet: {image_url[:80]}...")
             return image_url
@@ -13,7 +13,18 @@ class OpenAIClient:
         # Fix for httpx version incompatibility
         try:
             # Try with explicit http_client to avoid proxies issue
-            http_client = httpx.Client(timeout=60.0)
+            # One pooled HTTP/2 client per worker process: keep-alive connections are
+            # reused across tasks (no TCP+TLS handshake per call) and concurrent
+            # requests from gevent/threaded callers multiplex over the same socket
+            http_client = httpx.Client(
+                http2=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=50,
+                    max_connections=100,
+                    keepalive_expiry=30.0
+                ),
+                timeout=httpx.Timeout(60.0, connect=5.0)
+            )
             self.client = OpenAI(
                 api_key=settings.openai_api_key,
                 http_client=http_client
@@ -1,6 +1,6 @@
 # Redis client wrapper for video progress tracking
 import redis
-import json
+import orjson
 import logging
 from typing import Optional, Dict, Any
 from app.config import get_settings
@@ -10,6 +10,13 @@ logger = logging.getLogger(__name__)
 # Redis TTL: 60 minutes (3600 seconds)
 REDIS_TTL = 3600
 
+# Phase 1 plan cache TTL: 24 hours (plans don't depend on per-video state)
+PLAN_CACHE_TTL = 86400
+
+# Phase 1 dead-letter list: keep only the most recent failures
+PHASE1_DEAD_LETTER_KEY = "phase1_dead_letter"
+PHASE1_DEAD_LETTER_MAX = 1000
+
 
 class RedisClient:
     """Singleton Redis client for video progress tracking"""
@@ -78,7 +85,7 @@ class RedisClient:
         try:
             self._client.set(
                 self._key(video_id, "metadata"),
-                json.dumps(metadata),
+                orjson.dumps(metadata),
                 ex=REDIS_TTL
             )
             return True
@@ -108,7 +115,7 @@ class RedisClient:
         try:
             self._client.set(
                 self._key(video_id, "phase_outputs"),
-                json.dumps(phase_outputs),
+                orjson.dumps(phase_outputs),
                 ex=REDIS_TTL
             )
             return True
@@ -123,7 +130,7 @@ class RedisClient:
         try:
             self._client.set(
                 self._key(video_id, "spec"),
-                json.dumps(spec),
+                orjson.dumps(spec),
                 ex=REDIS_TTL
             )
             return True
@@ -138,7 +145,7 @@ class RedisClient:
         try:
             self._client.set(
                 self._key(video_id, "presigned_urls"),
-                json.dumps(urls),
+                orjson.dumps(urls),
                 ex=REDIS_TTL
             )
             return True
@@ -153,7 +160,7 @@ class RedisClient:
         try:
             self._client.set(
                 self._key(video_id, "storyboard_urls"),
-                json.dumps(urls),
+                orjson.dumps(urls),
                 ex=REDIS_TTL
             )
             return True
@@ -161,6 +168,106 @@ class RedisClient:
             logger.warning(f"Failed to set storyboard URLs in Redis: {e}")
             return False
     
+    def set_video_fields(self, video_id: str, fields: Dict[str, Any]) -> bool:
+        """Set several video fields in one round-trip (str values stored as-is, others as JSON)"""
+        if not self._client:
+            return False
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for field, value in fields.items():
+                pipe.set(
+                    self._key(video_id, field),
+                    value if isinstance(value, str) else orjson.dumps(value),
+                    ex=REDIS_TTL
+                )
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to set video fields in Redis: {e}")
+            return False
+    
+    def get_cached_plan(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached Phase 1 LLM planning output by prompt hash"""
+        if not self._client:
+            return None
+        try:
+            plan_str = self._client.get(f"phase1_plan_cache:{cache_key}")
+            return orjson.loads(plan_str) if plan_str else None
+        except Exception as e:
+            logger.warning(f"Failed to get cached plan from Redis: {e}")
+            return None
+    
+    def set_cached_plan(self, cache_key: str, plan: Dict[str, Any]) -> bool:
+        """Cache a Phase 1 LLM planning output by prompt hash"""
+        if not self._client:
+            return False
+        try:
+            self._client.set(
+                f"phase1_plan_cache:{cache_key}",
+                orjson.dumps(plan),
+                ex=PLAN_CACHE_TTL
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to set cached plan in Redis: {e}")
+            return False
+    
+    def acquire_plan_lock(self, cache_key: str, ttl: int) -> bool:
+        """Claim an in-flight Phase 1 planning slot for a prompt hash (SET NX with TTL)"""
+        if not self._client:
+            return False
+        try:
+            return bool(self._client.set(f"phase1_plan_lock:{cache_key}", "1", nx=True, ex=ttl))
+        except Exception as e:
+            logger.warning(f"Failed to acquire plan lock in Redis: {e}")
+            return False
+    
+    def plan_lock_held(self, cache_key: str) -> bool:
+        """Check whether a Phase 1 planning slot is still claimed"""
+        if not self._client:
+            return False
+        try:
+            return bool(self._client.exists(f"phase1_plan_lock:{cache_key}"))
+        except Exception as e:
+            logger.warning(f"Failed to check plan lock in Redis: {e}")
+            return False
+    
+    def release_plan_lock(self, cache_key: str) -> bool:
+        """Release an in-flight Phase 1 planning slot"""
+        if not self._client:
+            return False
+        try:
+            self._client.delete(f"phase1_plan_lock:{cache_key}")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to release plan lock in Redis: {e}")
+            return False
+    
+    def push_phase1_dead_letter(self, entry: Dict[str, Any]) -> bool:
+        """Record a failed Phase 1 run (video_id, prompt, traceback) for offline diagnostics"""
+        if not self._client:
+            return False
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.lpush(PHASE1_DEAD_LETTER_KEY, orjson.dumps(entry))
+            pipe.ltrim(PHASE1_DEAD_LETTER_KEY, 0, PHASE1_DEAD_LETTER_MAX - 1)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to push Phase 1 dead letter to Redis: {e}")
+            return False
+
+    def record_phase1_hedge_win(self, model: str) -> bool:
+        """Count a hedged Phase 1 race won by `model` (monotonic counter for tuning PHASE1_HEDGE_DELAY)"""
+        if not self._client:
+            return False
+        try:
+            self._client.incr(f"phase1:hedge_wins:{model}")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to record Phase 1 hedge win in Redis: {e}")
+            return False
+
     def get_video_data(self, video_id: str) -> Optional[Dict[str, Any]]:
         """Get all video data as dict"""
         if not self._client:
@@ -193,28 +300,28 @@ class RedisClient:
                 data["user_id"] = user_id
             if metadata_str:
                 try:
-                    data["metadata"] = json.loads(metadata_str)
-                except json.JSONDecodeError:
+                    data["metadata"] = orjson.loads(metadata_str)
+                except orjson.JSONDecodeError:
                     pass
             if phase_outputs_str:
                 try:
-                    data["phase_outputs"] = json.loads(phase_outputs_str)
-                except json.JSONDecodeError:
+                    data["phase_outputs"] = orjson.loads(phase_outputs_str)
+                except orjson.JSONDecodeError:
                     pass
             if spec_str:
                 try:
-                    data["spec"] = json.loads(spec_str)
-                except json.JSONDecodeError:
+                    data["spec"] = orjson.loads(spec_str)
+                except orjson.JSONDecodeError:
                     pass
             if presigned_urls_str:
                 try:
-                    data["presigned_urls"] = json.loads(presigned_urls_str)
-                except json.JSONDecodeError:
+                    data["presigned_urls"] = orjson.loads(presigned_urls_str)
+                except orjson.JSONDecodeError:
                     pass
             if storyboard_urls_str:
                 try:
-                    data["storyboard_urls"] = json.loads(storyboard_urls_str)
-                except json.JSONDecodeError:
+                    data["storyboard_urls"] = orjson.loads(storyboard_urls_str)
+                except orjson.JSONDecodeError:
                     pass
             
             # Add video_id
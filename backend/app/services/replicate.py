@@ -7,6 +7,27 @@ logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+def first_output_url(output) -> str:
+    """
+    First URL from a Replicate output (URL string, list/tuple, or iterator of URLs).
+    
+    Iterators are advanced by one item instead of being materialized with list().
+    
+    Raises:
+        ValueError: If the output is empty
+    """
+    if isinstance(output, (list, tuple)):
+        url = output[0] if output else None
+    elif hasattr(output, '__iter__') and not isinstance(output, (str, bytes)):
+        url = next(iter(output), None)
+    else:
+        url = output
+    
+    if not url:
+        raise ValueError("Replicate returned no output")
+    return url if isinstance(url, str) else str(url)
+
+
 class ReplicateClient:
     def __init__(self):
         self.client = replicate.Client(api_token=settings.replicate_api_token)
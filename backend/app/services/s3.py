@@ -1,4 +1,5 @@
 import boto3
+from botocore.config import Config
 import tempfile
 import os
 from app.config import get_settings
@@ -16,7 +17,14 @@ class S3Client:
             's3',
             region_name=settings.aws_region,
             aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key
+            aws_secret_access_key=settings.aws_secret_access_key,
+            # One client is shared by every thread in the process; botocore's default
+            # pool of 10 connections would serialize uploads beyond that. TCP keepalive
+            # stops idle pooled connections from being silently dropped between tasks.
+            config=Config(
+                max_pool_connections=settings.s3_max_pool_connections,
+                tcp_keepalive=True
+            )
         )
         self.bucket = settings.s3_bucket
     
@@ -25,6 +33,12 @@ class S3Client:
         self.client.upload_file(file_path, self.bucket, key)
         return f"s3://{self.bucket}/{key}"
     
+    def upload_bytes(self, data: bytes, key: str, content_type: str = None) -> str:
+        """Upload in-memory content to S3 (single PUT - no temp file round-trip)"""
+        extra = {'ContentType': content_type} if content_type else {}
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data, **extra)
+        return f"s3://{self.bucket}/{key}"
+    
     def generate_presigned_url(self, key: str, expiration: int = 3600) -> str:
         """Generate presigned URL"""
         return self.client.generate_presigned_url(
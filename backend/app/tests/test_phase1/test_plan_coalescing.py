@@ -0,0 +1,101 @@
+import pytest
+import app.orchestrator.celery_app  # noqa: F401 - loads the task modules in their real import order
+from app.phases.phase1_validate import task as phase1_task
+
+
+CACHED_PLAN = {
+    "intent_analysis": {
+        "product": {"name": "Test Watch", "category": "luxury"},
+        "duration": 15,
+        "style_keywords": ["elegant"],
+        "mood": "elegant",
+        "key_message": "Timeless design"
+    },
+    "selected_archetype": "luxury_showcase",
+    "archetype_reasoning": "Premium product",
+    "beat_sequence": [
+        {"beat_id": "hero_shot", "duration": 10, "composed_prompt": "A detailed hero shot of the watch"},
+        {"beat_id": "call_to_action", "duration": 5, "composed_prompt": "The watch with the brand logo"}
+    ],
+    "beat_selection_reasoning": "Classic structure",
+    "style": {"aesthetic": "cinematic", "color_palette": ["gold", "black"], "mood": "elegant", "lighting": "soft"},
+    "reference_mapping": None
+}
+
+
+class FakePlanRedis:
+    """Plan cache + lock with another task already holding the lock"""
+    _client = True
+
+    def __init__(self, polls_until_cached: int):
+        self.polls_until_cached = polls_until_cached
+        self.lock_ttls = []
+        self.dead_letters = []
+
+    def get_cached_plan(self, cache_key):
+        if self.polls_until_cached <= 0:
+            return CACHED_PLAN
+        self.polls_until_cached -= 1
+        return None
+
+    def acquire_plan_lock(self, cache_key, ttl):
+        self.lock_ttls.append(ttl)
+        return False
+
+    def plan_lock_held(self, cache_key):
+        return True
+
+    def release_plan_lock(self, cache_key):
+        raise AssertionError("a follower must not release the leader's lock")
+
+    def push_phase1_dead_letter(self, entry):
+        self.dead_letters.append(entry)
+
+
+class NoOpenAI:
+    def __getattr__(self, name):
+        raise AssertionError("a follower must not call OpenAI")
+
+
+@pytest.fixture
+def follower(monkeypatch):
+    fake_redis = FakePlanRedis(polls_until_cached=3)
+    monkeypatch.setattr(phase1_task, "redis_client", fake_redis)
+    monkeypatch.setattr(phase1_task, "openai_client", NoOpenAI())
+    monkeypatch.setattr(phase1_task, "PLAN_CACHE_ENABLED", True)
+    monkeypatch.setattr(phase1_task.time, "sleep", lambda seconds: None)
+    return fake_redis
+
+
+def test_follower_reuses_leader_plan_without_calling_openai(follower):
+    output = phase1_task.plan_video_intelligent.run(
+        None, video_id="vid-follower", prompt="A 15 second elegant watch ad"
+    )
+
+    assert output["status"] == "success"
+    assert output["output_data"]["cache_hit"] is True
+    assert output["output_data"]["model_used"] == "plan_cache"
+    assert output["output_data"]["spec"]["duration"] == 15
+    assert follower.dead_letters == []
+
+
+def test_plan_lock_outlives_leader_budget(follower):
+    phase1_task.plan_video_intelligent.run(None, video_id="vid-follower", prompt="A 15 second elegant watch ad")
+
+    assert follower.lock_ttls == [phase1_task.PHASE1_SOFT_TIME_LIMIT]
+
+
+def test_follower_waits_within_its_own_budget(monkeypatch):
+    waits = []
+    monkeypatch.setattr(phase1_task, "redis_client", FakePlanRedis(polls_until_cached=0))
+    monkeypatch.setattr(phase1_task, "PLAN_CACHE_ENABLED", True)
+    monkeypatch.setattr(phase1_task.redis_client, "get_cached_plan", lambda cache_key: None)
+    monkeypatch.setattr(
+        phase1_task, "_wait_for_cached_plan",
+        lambda cache_key, timeout: waits.append(timeout) or CACHED_PLAN
+    )
+
+    phase1_task.plan_video_intelligent.run(None, video_id="vid-follower", prompt="A 15 second elegant watch ad")
+
+    assert len(waits) == 1
+    assert phase1_task.PHASE1_TIMEOUT < waits[0] <= phase1_task.PHASE1_SOFT_TIME_LIMIT
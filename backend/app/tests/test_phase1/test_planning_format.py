@@ -0,0 +1,35 @@
+import app.orchestrator.celery_app  # noqa: F401 - loads the task modules in their real import order
+from app.phases.phase1_validate.task import _planning_text_format
+from app.phases.phase1_validate.schemas import VideoPlanning
+
+
+def _subschemas(schema):
+    """Yield every (sub)schema dict nested anywhere in a JSON schema"""
+    if isinstance(schema, dict):
+        yield schema
+        for value in schema.values():
+            yield from _subschemas(value)
+    elif isinstance(schema, list):
+        for item in schema:
+            yield from _subschemas(item)
+
+
+def test_planning_text_format_is_strict_json_schema():
+    text_format = _planning_text_format()
+    assert text_format['type'] == 'json_schema'
+    assert text_format['name'] == 'VideoPlanning'
+    assert text_format['strict'] is True
+    assert set(text_format['schema']['properties']) == set(VideoPlanning.model_fields)
+
+
+def test_planning_schema_objects_are_closed_and_fully_required():
+    for schema in _subschemas(_planning_text_format()['schema']):
+        if 'properties' in schema:
+            assert schema['additionalProperties'] is False
+            assert schema['required'] == list(schema['properties'])
+
+
+def test_planning_schema_has_no_null_defaults_or_ref_siblings():
+    for schema in _subschemas(_planning_text_format()['schema']):
+        assert not ('default' in schema and schema['default'] is None)
+        assert '$ref' not in schema or len(schema) == 1
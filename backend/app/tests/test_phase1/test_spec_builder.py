@@ -0,0 +1,68 @@
+import pytest
+from app.common.beat_library import BEAT_LIBRARY
+from app.phases.phase1_validate.validation import build_full_spec, validate_spec
+
+
+def _llm_output(beats):
+    """Minimal LLM planning output for the given (beat_id, duration) pairs"""
+    return {
+        "intent_analysis": {
+            "product": {"name": "Test Watch", "category": "luxury"},
+            "duration": sum(d for _, d in beats),
+            "style_keywords": ["elegant"],
+            "mood": "elegant",
+            "key_message": "Timeless design"
+        },
+        "selected_archetype": "luxury_showcase",
+        "archetype_reasoning": "Premium product",
+        "beat_sequence": [
+            {"beat_id": beat_id, "duration": duration, "composed_prompt": f"A detailed {beat_id} scene"}
+            for beat_id, duration in beats
+        ],
+        "beat_selection_reasoning": "Classic structure",
+        "style": {
+            "aesthetic": "cinematic",
+            "color_palette": ["gold", "black"],
+            "mood": "elegant",
+            "lighting": "soft"
+        }
+    }
+
+
+def test_build_full_spec_computes_starts_and_duration():
+    """Test that beats are laid out back-to-back"""
+    spec = build_full_spec(_llm_output([("hero_shot", 5), ("lifestyle_context", 10), ("call_to_action", 5)]), "vid-1")
+
+    assert spec["duration"] == 20
+    assert [b["start"] for b in spec["beats"]] == [0, 5, 15]
+    assert spec["beats"][1]["prompt"] == "A detailed lifestyle_context scene"
+
+
+def test_build_full_spec_does_not_alias_beat_library():
+    """Test that mutating a built spec never leaks into the shared BEAT_LIBRARY"""
+    original = list(BEAT_LIBRARY["hero_shot"]["compatible_products"])
+    spec = build_full_spec(_llm_output([("hero_shot", 5)]), "vid-1")
+
+    spec["beats"][0]["compatible_products"].append("mutated")
+    spec["beats"][0]["duration"] = 15
+
+    assert BEAT_LIBRARY["hero_shot"]["compatible_products"] == original
+    assert BEAT_LIBRARY["hero_shot"]["duration"] == 5
+
+
+def test_validate_spec_duration_mismatch():
+    """Test that validation catches beats not summing to the video duration"""
+    spec = build_full_spec(_llm_output([("hero_shot", 5), ("call_to_action", 5)]), "vid-1")
+    spec["duration"] = 30
+
+    with pytest.raises(ValueError, match="Beat durations sum to 10s, expected 30s"):
+        validate_spec(spec)
+
+
+def test_validate_spec_unknown_beat():
+    """Test that validation rejects beat_ids outside the library"""
+    spec = build_full_spec(_llm_output([("hero_shot", 5)]), "vid-1")
+    spec["beats"][0]["beat_id"] = "nonexistent"
+
+    with pytest.raises(ValueError, match="Unknown beat_id"):
+        validate_spec(spec)
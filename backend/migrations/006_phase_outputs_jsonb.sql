@@ -0,0 +1,15 @@
+-- Convert video_generations.phase_outputs to JSONB
+-- Migration: 006_phase_outputs_jsonb
+-- Date: 2026-10-18
+
+-- Databases created via SQLAlchemy create_all() got a JSON column; phase saves
+-- update a single key server-side with jsonb_set, which needs JSONB
+DO $$ 
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns 
+        WHERE table_name = 'video_generations' AND column_name = 'phase_outputs' AND data_type = 'json'
+    ) THEN
+        ALTER TABLE video_generations ALTER COLUMN phase_outputs TYPE JSONB USING phase_outputs::jsonb;
+    END IF;
+END $$;
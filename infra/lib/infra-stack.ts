@@ -335,6 +335,28 @@ export class DaveVictorVincentAIVideoGenerationStack extends cdk.Stack {
       ephemeralStorageGiB: 21, // 21GB minimum for CLIP model download/extraction (Fargate minimum is 21GiB)
     });
 
+    // Environment shared by the worker services (prefork and gevent llm_io)
+    const workerEnvironment = {
+      // Database - construct DATABASE_URL from Aurora components
+      DATABASE_URL: `postgresql://${dbUsername}:${dbPassword}@${auroraCluster.clusterEndpoint.hostname}:${auroraCluster.clusterEndpoint.port}/videogen`,
+      REDIS_URL: 'redis://redis.aivideo.local:6379/0',
+      S3_BUCKET: videoBucket.bucketName,
+      AWS_REGION: this.region,
+      // External APIs - from environment variables (set by GitHub Actions)
+      REPLICATE_API_TOKEN: process.env.REPLICATE_API_TOKEN || '',
+      OPENAI_API_KEY: process.env.OPENAI_API_KEY || '',
+      // AWS Credentials - from environment variables (set by GitHub Actions)
+      AWS_ACCESS_KEY_ID: process.env.AWS_ACCESS_KEY_ID || '',
+      AWS_SECRET_ACCESS_KEY: process.env.AWS_SECRET_ACCESS_KEY || '',
+      // Firebase credentials - from environment variables (set by GitHub Actions)
+      FIREBASE_PROJECT_ID: firebaseProjectId,
+      FIREBASE_PRIVATE_KEY: firebasePrivateKey,
+      FIREBASE_CLIENT_EMAIL: firebaseClientEmail,
+      // Application environment - explicitly set for production
+      ENVIRONMENT: 'production',
+      DEBUG: 'false',
+    };
+
     // Extract tag from image URI (default to 'latest')
     const workerImageTag = imageUri.includes(':') ? imageUri.split(':')[1] : 'latest';
     const workerContainer = workerTaskDefinition.addContainer('WorkerContainer', {
@@ -354,27 +376,7 @@ export class DaveVictorVincentAIVideoGenerationStack extends cdk.Stack {
         '--concurrency=2',  // Reduced from 4 to 2 to reduce memory pressure per worker
       ],
 
-      // MERGED environment block (only one allowed)
-      environment: {
-        // Database - construct DATABASE_URL from Aurora components
-        DATABASE_URL: `postgresql://${dbUsername}:${dbPassword}@${auroraCluster.clusterEndpoint.hostname}:${auroraCluster.clusterEndpoint.port}/videogen`,
-        REDIS_URL: 'redis://redis.aivideo.local:6379/0',
-        S3_BUCKET: videoBucket.bucketName,
-        AWS_REGION: this.region,
-        // External APIs - from environment variables (set by GitHub Actions)
-        REPLICATE_API_TOKEN: process.env.REPLICATE_API_TOKEN || '',
-        OPENAI_API_KEY: process.env.OPENAI_API_KEY || '',
-        // AWS Credentials - from environment variables (set by GitHub Actions)
-        AWS_ACCESS_KEY_ID: process.env.AWS_ACCESS_KEY_ID || '',
-        AWS_SECRET_ACCESS_KEY: process.env.AWS_SECRET_ACCESS_KEY || '',
-        // Firebase credentials - from environment variables (set by GitHub Actions)
-        FIREBASE_PROJECT_ID: firebaseProjectId,
-        FIREBASE_PRIVATE_KEY: firebasePrivateKey,
-        FIREBASE_CLIENT_EMAIL: firebaseClientEmail,
-        // Application environment - explicitly set for production
-        ENVIRONMENT: 'production',
-        DEBUG: 'false',
-      },
+      environment: workerEnvironment,
 
       healthCheck: {
         command: [
@@ -405,6 +407,68 @@ export class DaveVictorVincentAIVideoGenerationStack extends cdk.Stack {
     // Ensure Redis is ready before starting Worker
     workerService.node.addDependency(redisService);
 
+    // LLM I/O Worker Service
+    // Phase 1 planning (llm_io queue) is almost entirely waiting on OpenAI, so it runs on a
+    // gevent pool: one process keeps many planning calls in flight instead of each holding
+    // one of the prefork worker's 2 processes. No video processing here, so a small task.
+    const llmWorkerTaskDefinition = new ecs.FargateTaskDefinition(this, 'LlmWorkerTaskDefinition', {
+      memoryLimitMiB: 1024,
+      cpu: 512,
+      executionRole: taskExecutionRole,
+    });
+
+    llmWorkerTaskDefinition.addContainer('LlmWorkerContainer', {
+      image: ecs.ContainerImage.fromEcrRepository(ecrRepository, workerImageTag),
+      memoryLimitMiB: 1024,
+      logging: ecs.LogDrivers.awsLogs({
+        streamPrefix: 'worker-llm',
+        logGroup,
+      }),
+
+      command: [
+        'celery',
+        '-A',
+        'app.orchestrator.celery_app',
+        'worker',
+        '--loglevel=info',
+        '-Q',
+        'llm_io',
+        '-P',
+        'gevent',
+        '--concurrency=50',
+      ],
+
+      environment: workerEnvironment,
+
+      healthCheck: {
+        command: [
+          'CMD-SHELL',
+          'pgrep -f "celery.*worker" > /dev/null || exit 1'
+        ],
+        interval: cdk.Duration.seconds(30),
+        timeout: cdk.Duration.seconds(10),
+        retries: 3,
+        startPeriod: cdk.Duration.seconds(60),
+      },
+    });
+
+    const llmWorkerService = new ecs.FargateService(this, 'LlmWorkerService', {
+      cluster,
+      taskDefinition: llmWorkerTaskDefinition,
+      desiredCount: 1,
+      securityGroups: [ecsSecurityGroup],
+      vpcSubnets: {
+        subnetType: ec2.SubnetType.PUBLIC,
+      },
+      assignPublicIp: true,
+      enableExecuteCommand: true,
+      minHealthyPercent: 100,
+      maxHealthyPercent: 300,
+    });
+
+    // Ensure Redis is ready before starting the LLM worker
+    llmWorkerService.node.addDependency(redisService);
+
     // Outputs
     new cdk.CfnOutput(this, 'ClusterName', {
       value: cluster.clusterName,